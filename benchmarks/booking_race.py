@@ -0,0 +1,131 @@
+"""Race hundreds of concurrent bookings for a handful of popular slots against a local SQLite DB.
+
+Every client calls ShopService.book_slots with its own session, the way concurrent
+POST /book-slots/ requests would. The run reports throughput, latency percentiles and the
+number of double-booked slots, which must be zero.
+
+Usage:
+    python -m benchmarks.booking_race --clients 300 --slots 12
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, time as dt_time
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.logger import logger
+from src.db.database import Base
+from src.db.models import Barber, BarberSlot, Booking, Shop, User
+from src.services.shop_service import ShopService
+
+
+async def seed(session_factory, clients: int, slots: int):
+    async with session_factory() as db:
+        db.add_all([User(id=i, username=f"user{i}", role="customer") for i in range(1, clients + 1)])
+        db.add(Shop(shop_id=1, owner_id=1, shop_name="Bench Shop", address="Main Road", city="Hyderabad",
+                    state="TS", open_time=dt_time(9), close_time=dt_time(22)))
+        db.add(Barber(barber_id=1, barber_name="Ravi", shop_id=1, start_time=dt_time(9), end_time=dt_time(22)))
+        # Popular evening slots everyone wants.
+        db.add_all([
+            BarberSlot(slot_id=i, barber_id=1, shop_id=1, slot_date=date.today(),
+                       slot_time=dt_time(17 + (i - 1) // 4, ((i - 1) % 4) * 15), is_booked=False, status="available")
+            for i in range(1, slots + 1)
+        ])
+        await db.commit()
+
+
+async def client(session_factory, user_id: int, slot_ids: list[int], start: asyncio.Event):
+    await start.wait()
+    started = time.perf_counter()
+    async with session_factory() as db:
+        try:
+            await ShopService.book_slots(db, user_id, 1, 1, slot_ids)
+            outcome = "booked"
+        except HTTPException as e:
+            outcome = f"rejected_{e.status_code}"
+        except Exception as e:
+            outcome = f"error_{type(e).__name__}"
+    return outcome, time.perf_counter() - started
+
+
+async def run(clients: int, slots: int, max_batch: int, seed_value: int):
+    random.seed(seed_value)
+    db_path = os.path.join(tempfile.mkdtemp(prefix="booking_race_"), "bench.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        connect_args={"timeout": 30},
+        pool_size=20,
+        max_overflow=0,
+        pool_timeout=60,
+    )
+    session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, clients, slots)
+
+    start = asyncio.Event()
+    tasks = [
+        asyncio.create_task(client(
+            session_factory, user_id, random.sample(range(1, slots + 1), random.randint(1, max_batch)), start
+        ))
+        for user_id in range(1, clients + 1)
+    ]
+    began = time.perf_counter()
+    start.set()
+    results = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - began
+
+    async with session_factory() as db:
+        per_slot = (await db.execute(
+            select(Booking.slot_id, func.count()).group_by(Booking.slot_id)
+        )).all()
+        booked_flags = (await db.execute(
+            select(func.count()).select_from(BarberSlot).filter(BarberSlot.is_booked == True)
+        )).scalar_one()
+    await engine.dispose()
+
+    latencies_ms = sorted(latency * 1000 for _, latency in results)
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    double_bookings = sum(count - 1 for _, count in per_slot if count > 1)
+    orphan_flags = booked_flags - len(per_slot)
+
+    print(f"clients            : {clients}")
+    print(f"hot slots          : {slots}")
+    print(f"elapsed            : {elapsed:.3f} s")
+    print(f"throughput         : {clients / elapsed:.1f} req/s")
+    print(f"latency p50        : {statistics.median(latencies_ms):.2f} ms")
+    print(f"latency p99        : {latencies_ms[max(0, int(len(latencies_ms) * 0.99) - 1)]:.2f} ms")
+    print(f"outcomes           : {dict(sorted(outcomes.items()))}")
+    print(f"slots booked       : {len(per_slot)}/{slots}")
+    print(f"double bookings    : {double_bookings}")
+    print(f"booked w/o booking : {orphan_flags}")
+    return double_bookings + abs(orphan_flags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--slots", type=int, default=12)
+    parser.add_argument("--max-batch", type=int, default=3, help="max slots requested per client")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.ERROR)
+    anomalies = asyncio.run(run(args.clients, args.slots, args.max_batch, args.seed))
+    raise SystemExit(1 if anomalies else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Compare the entity-hydrating and column-projection read paths of the list endpoints.
+
+For each endpoint the old path loads ORM entities, copies them into dicts and encodes them the
+way the route used to (FastAPI's jsonable_encoder + json, or pydantic validation + dump_json).
+The new path selects only the needed columns as rows and encodes the dicts with orjson. Both
+paths run against the same throwaway SQLite database; the report is the median time per row.
+
+Usage:
+    python -m benchmarks.read_paths --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, time as dt_time
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+
+from src.core.logger import logger
+from src.db.database import Base
+from src.db.models import Barber, Menu, Shop, User
+from src.repositories.barber_repo import BarberRepository
+from src.repositories.menu_repo import MenuRepository
+from src.repositories.shop_repo import ShopRepository
+from src.schemas.menu_schemas import MenuResponse
+from src.services.barber_service import _barber_to_dict
+from src.services.shop_service import _shop_to_dict
+
+_menu_list_adapter = TypeAdapter(List[MenuResponse])
+
+
+def _menu_to_dict(m):
+    return {
+        "menu_id": m.menu_id,
+        "service_name": m.service_name,
+        "description": m.description,
+        "price": float(m.price),
+        "duration_minutes": m.duration_minutes,
+        "is_active": m.is_active,
+        "created_at": m.created_at,
+    }
+
+
+async def seed(session_factory, rows: int):
+    now = datetime(2025, 11, 4, 9, 0)
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", role="owner"))
+        db.add_all([
+            Shop(shop_id=i, owner_id=1, shop_name=f"Shop {i}", address="Main Road", city="Hyderabad", state="TS",
+                 open_time=dt_time(9), close_time=dt_time(21))
+            for i in range(1, rows + 1)
+        ])
+        db.add_all([
+            Barber(barber_id=i, barber_name=f"Barber {i}", shop_id=1, start_time=dt_time(9), end_time=dt_time(18),
+                   is_available=True, generate_daily=True, created_at=now)
+            for i in range(1, rows + 1)
+        ])
+        db.add_all([
+            Menu(menu_id=i, shop_id=1, service_name=f"Service {i}", description="Includes wash", price=199.5,
+                 duration_minutes=30, is_active=True, created_at=now)
+            for i in range(1, rows + 1)
+        ])
+        await db.commit()
+
+
+async def old_owner_shops(db):
+    shops = (await db.execute(select(Shop).filter(Shop.owner_id == 1))).scalars().all()
+    return json.dumps(jsonable_encoder([_shop_to_dict(s) for s in shops])).encode()
+
+
+async def new_owner_shops(db):
+    return orjson.dumps([_shop_to_dict(r) for r in await ShopRepository.get_shops_by_owner(db, 1)])
+
+
+async def old_menu(db):
+    items = (await db.execute(select(Menu).filter(Menu.shop_id == 1))).scalars().all()
+    return _menu_list_adapter.dump_json(_menu_list_adapter.validate_python([_menu_to_dict(m) for m in items]))
+
+
+async def new_menu(db):
+    return orjson.dumps([_menu_to_dict(r) for r in await MenuRepository.get_menu_by_shop(db, 1)])
+
+
+async def old_barbers(db):
+    barbers = (await db.execute(
+        select(Barber).filter(Barber.shop_id == 1, Barber.is_available == True)
+    )).scalars().all()
+    return json.dumps(jsonable_encoder(barbers)).encode()
+
+
+async def new_barbers(db):
+    return orjson.dumps([_barber_to_dict(r) for r in await BarberRepository.get_available_barbers(db, 1)])
+
+
+CASES = [
+    ("GET /shops/owner/{id}", old_owner_shops, new_owner_shops),
+    ("GET /menu/shop/{id}", old_menu, new_menu),
+    ("GET /barbers/available/{id}", old_barbers, new_barbers),
+]
+
+
+async def timed(session_factory, path):
+    # A fresh session per call, like a request: nothing is served from a warm identity map
+    async with session_factory() as db:
+        started = time.perf_counter()
+        body = await path(db)
+        return time.perf_counter() - started, body
+
+
+async def compare(session_factory, old_path, new_path, repeat: int):
+    """Median time of each path, with runs interleaved so both see the same machine noise."""
+    old_timings, new_timings = [], []
+    for _ in range(repeat):
+        elapsed, old_body = await timed(session_factory, old_path)
+        old_timings.append(elapsed)
+        elapsed, new_body = await timed(session_factory, new_path)
+        new_timings.append(elapsed)
+    return statistics.median(old_timings), old_body, statistics.median(new_timings), new_body
+
+
+async def run(rows: int, repeat: int):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="read_paths_"), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, rows)
+
+    print(f"rows per response  : {rows}")
+    print(f"{'endpoint':<30}{'entities us/row':>17}{'columns us/row':>16}{'speedup':>9}")
+    for name, old_path, new_path in CASES:
+        old_median, old_body, new_median, new_body = await compare(session_factory, old_path, new_path, repeat)
+        assert json.loads(old_body) == json.loads(new_body), f"{name}: bodies differ"
+        print(f"{name:<30}{old_median / rows * 1e6:>17.2f}{new_median / rows * 1e6:>16.2f}"
+              f"{old_median / new_median:>8.1f}x")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50, help="interleaved runs per path; the median is reported")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.ERROR)
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
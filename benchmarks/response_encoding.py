@@ -0,0 +1,100 @@
+"""Time how list responses are turned into bytes, on 1k-row payloads shaped like the shop endpoints.
+
+Three paths are compared for each payload:
+  validated+json   FastAPI's default: validate against response_model, serialize, render with json
+  validated+orjson the same validation, rendered by ORJSONResponse (default_response_class only)
+  orjson           the route returns ORJSONResponse(payload) and skips response_model validation
+No database is involved; the payloads are the dicts the services return.
+
+Usage:
+    python -m benchmarks.response_encoding --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, time as dt_time
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.schemas.shop_schemas import EarliestSlotResponse, ShopResponse, SlotResponse
+
+
+def shop_rows(rows: int):
+    return [
+        {"shop_id": i, "shop_name": f"Shop {i}", "address": "Main Road", "city": "Hyderabad", "state": "TS",
+         "open_time": str(dt_time(9)), "close_time": str(dt_time(21)), "is_open": True}
+        for i in range(1, rows + 1)
+    ]
+
+
+def slot_rows(rows: int):
+    return [
+        {"slot_id": i, "barber_id": i % 8 + 1, "barber_name": f"Barber {i % 8 + 1}",
+         "slot_time": str(dt_time(9 + i % 12, (i % 4) * 15)), "status": "available"}
+        for i in range(1, rows + 1)
+    ]
+
+
+def earliest_rows(rows: int):
+    return [
+        {"slot_id": i, "slot_date": str(date(2025, 11, 4)), "slot_time": str(dt_time(9 + i % 12)),
+         "shop_id": i % 50 + 1, "shop_name": f"Shop {i % 50 + 1}", "city": "Hyderabad", "state": "TS",
+         "barber_id": i % 8 + 1, "barber_name": f"Barber {i % 8 + 1}"}
+        for i in range(1, rows + 1)
+    ]
+
+
+CASES = [
+    ("GET /shops/", List[ShopResponse], shop_rows),
+    ("GET /shops/{id}/slots/", List[SlotResponse], slot_rows),
+    ("GET /slots/earliest", List[EarliestSlotResponse], earliest_rows),
+]
+
+
+async def validated(field, payload, response_class):
+    content = await serialize_response(field=field, response_content=payload)
+    return response_class(content).body
+
+
+async def unvalidated(field, payload, response_class):
+    return response_class(payload).body
+
+
+async def best_of(path, field, payload, response_class, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await path(field, payload, response_class)
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+
+async def run(rows: int, repeat: int):
+    print(f"rows per response  : {rows}")
+    print(f"{'endpoint':<26}{'validated+json ms':>19}{'validated+orjson ms':>21}{'orjson ms':>11}{'speedup':>9}")
+    for name, model, build in CASES:
+        # The same kind of field FastAPI builds for a route's response_model
+        field = create_model_field(name="Response", type_=model, mode="serialization")
+        payload = build(rows)
+        baseline, json_body = await best_of(validated, field, payload, JSONResponse, repeat)
+        middle, _ = await best_of(validated, field, payload, ORJSONResponse, repeat)
+        fast, orjson_body = await best_of(unvalidated, field, payload, ORJSONResponse, repeat)
+        assert json.loads(json_body) == json.loads(orjson_body), f"{name}: bodies differ"
+        print(f"{name:<26}{baseline * 1e3:>19.2f}{middle * 1e3:>21.2f}{fast * 1e3:>11.2f}"
+              f"{baseline / fast:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50, help="runs per path; the fastest is reported")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,32 @@
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from pyinstrument import Profiler
 
+from src.core.config import ADMIN_ROUTES_ENABLED, PROFILING_ENABLED
 from src.core.logger import logger
+from src.core.profiling import SamplingProfilerMiddleware, flush_profiles
 from src.core.scheduler import start_scheduler, shutdown_scheduler
-from src.db.database import Base, engine
-from src.api.routers import user_router, shop_routes, barber_routes, menu_routes
-
-
-#  Middleware for profiling
-class PyInstrumentMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        profiler = Profiler()
-        profiler.start()
-
-        response = await call_next(request)
-
-        profiler.stop()
-        # Print summary to console
-        print(profiler.output_text(unicode=True, color=True))
-
-        # Save detailed report for later inspection
-        with open("pyinstrument_report.txt", "w", encoding="utf-8") as f:
-            f.write(profiler.output_text(unicode=True))
-
-        return response
+from src.db.query_stats import QueryStatsMiddleware
+from src.jobs.email_outbox import close_mailer
+from src.api.routers import user_router, shop_routes, barber_routes, menu_routes, admin_routes
 
 
 # Initialize FastAPI application
 app = FastAPI(
     title="Online Booking Application",
     description="Backend service for user, shop, and barber management with background schedulers.",
-    version="1.0.0"
+    version="1.0.0",
+    # Routes that return plain data are rendered with orjson instead of json.dumps
+    default_response_class=ORJSONResponse,
 )
 
-# Add the profiler middleware (only for development)
-app.add_middleware(PyInstrumentMiddleware)
+# Sampled profiling, off unless PROFILING_ENABLED=true
+if PROFILING_ENABLED:
+    app.add_middleware(SamplingProfilerMiddleware)
+
+# Per-request statement/commit counts in the log
+app.add_middleware(QueryStatsMiddleware)
 
 # Configure CORS
 origins = [
@@ -50,6 +39,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let cross-origin scripts read response headers listed here
+    expose_headers=["X-Next-Cursor", "X-DB-Statements", "X-DB-Time-Ms"],
 )
 
 # Include routers
@@ -57,13 +48,13 @@ app.include_router(user_router.router, tags=["Users"])
 app.include_router(shop_routes.router, tags=["Shops"])
 app.include_router(barber_routes.router, tags=["Barbers"])
 app.include_router(menu_routes.router, tags=["Menu"])
+# Unauthenticated metrics and profiles, only mounted when ADMIN_ROUTES_ENABLED=true
+if ADMIN_ROUTES_ENABLED:
+    app.include_router(admin_routes.router, tags=["Admin"])
 # Application startup event
 @app.on_event("startup")
 async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database initialized successfully.")
-
+    # Schema is managed by Alembic: run `alembic upgrade head` before starting the app.
     start_scheduler(app)
     logger.info("Application startup complete. Scheduler initialized.")
 
@@ -71,7 +62,10 @@ async def on_startup():
 # Application shutdown event
 @app.on_event("shutdown")
 async def on_shutdown():
-    shutdown_scheduler()
+    await shutdown_scheduler()
+    await close_mailer()
+    if PROFILING_ENABLED:
+        await flush_profiles()
     logger.info("Application shutdown completed successfully.")
 
 
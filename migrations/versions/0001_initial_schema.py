@@ -0,0 +1,166 @@
+"""initial schema
+
+Tables as previously created by Base.metadata.create_all on startup. Databases that were
+created that way already match this revision: run `alembic stamp 0001` once, then upgrade.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 17:36:36.819042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('email_verification',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=150), nullable=False),
+    sa.Column('otp_code', sa.String(length=10), nullable=False),
+    sa.Column('otp_expiry', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_index(op.f('ix_email_verification_id'), 'email_verification', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=150), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=True),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.String(length=20), nullable=True),
+    sa.Column('otp_code', sa.String(length=10), nullable=True),
+    sa.Column('otp_expiry', sa.DateTime(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('phone_number')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('shops',
+    sa.Column('shop_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('shop_name', sa.String(length=200), nullable=False),
+    sa.Column('address', sa.Text(), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('state', sa.String(length=100), nullable=False),
+    sa.Column('open_time', sa.Time(), nullable=False),
+    sa.Column('close_time', sa.Time(), nullable=False),
+    sa.Column('is_open', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('shop_id')
+    )
+    op.create_index(op.f('ix_shops_shop_id'), 'shops', ['shop_id'], unique=False)
+    op.create_table('barbers',
+    sa.Column('barber_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('barber_name', sa.String(length=200), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('generate_daily', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.shop_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('barber_id')
+    )
+    op.create_index(op.f('ix_barbers_barber_id'), 'barbers', ['barber_id'], unique=False)
+    op.create_table('menu',
+    sa.Column('menu_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('service_name', sa.String(length=150), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.shop_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('menu_id')
+    )
+    op.create_index(op.f('ix_menu_menu_id'), 'menu', ['menu_id'], unique=False)
+    op.create_table('barber_availability',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('available_date', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=True),
+    sa.Column('end_time', sa.Time(), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.barber_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('barber_id', 'available_date', name='uq_barber_availability')
+    )
+    op.create_index(op.f('ix_barber_availability_id'), 'barber_availability', ['id'], unique=False)
+    op.create_table('barber_slots',
+    sa.Column('slot_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('slot_date', sa.Date(), nullable=False),
+    sa.Column('slot_time', sa.Time(), nullable=False),
+    sa.Column('is_booked', sa.Boolean(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.barber_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.shop_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('slot_id')
+    )
+    op.create_index(op.f('ix_barber_slots_slot_id'), 'barber_slots', ['slot_id'], unique=False)
+    op.create_table('bookings',
+    sa.Column('booking_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('barber_id', sa.Integer(), nullable=False),
+    sa.Column('shop_id', sa.Integer(), nullable=False),
+    sa.Column('slot_id', sa.Integer(), nullable=False),
+    sa.Column('booking_date', sa.Date(), nullable=False),
+    sa.Column('booking_time', sa.Time(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['barber_id'], ['barbers.barber_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['shop_id'], ['shops.shop_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['slot_id'], ['barber_slots.slot_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('booking_id')
+    )
+    op.create_index(op.f('ix_bookings_booking_id'), 'bookings', ['booking_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_booking_id'), table_name='bookings')
+
+    op.drop_table('bookings')
+    op.drop_index(op.f('ix_barber_slots_slot_id'), table_name='barber_slots')
+
+    op.drop_table('barber_slots')
+    op.drop_index(op.f('ix_barber_availability_id'), table_name='barber_availability')
+
+    op.drop_table('barber_availability')
+    op.drop_index(op.f('ix_menu_menu_id'), table_name='menu')
+
+    op.drop_table('menu')
+    op.drop_index(op.f('ix_barbers_barber_id'), table_name='barbers')
+
+    op.drop_table('barbers')
+    op.drop_index(op.f('ix_shops_shop_id'), table_name='shops')
+
+    op.drop_table('shops')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+
+    op.drop_table('users')
+    op.drop_index(op.f('ix_email_verification_id'), table_name='email_verification')
+
+    op.drop_table('email_verification')
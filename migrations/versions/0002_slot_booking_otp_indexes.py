@@ -0,0 +1,78 @@
+"""slot, booking and otp indexes
+
+Adds the composite and unique keys the slot listing, slot generator, booking engine and OTP
+purge rely on. Before the unique keys are created, duplicate slots left behind by overlapping
+generator runs are collapsed onto one row per (barber_id, slot_date, slot_time), preferring a booked
+copy, their bookings are re-pointed to that row, and duplicate bookings of one slot (from the old
+read-then-write booking path) are reduced to the earliest.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 17:40:12.104317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The slot each (barber_id, slot_date, slot_time) group keeps: its lowest booked copy, else its lowest id
+    keeper_of_group = (
+        "SELECT COALESCE(MIN(CASE WHEN k.is_booked = 1 THEN k.slot_id END), MIN(k.slot_id))"
+        " FROM barber_slots s JOIN barber_slots k"
+        " ON k.barber_id = s.barber_id AND k.slot_date = s.slot_date AND k.slot_time = s.slot_time"
+    )
+    op.execute(sa.text(
+        f"UPDATE bookings SET slot_id = ({keeper_of_group} WHERE s.slot_id = bookings.slot_id)"
+        " WHERE slot_id IN (SELECT slot_id FROM barber_slots)"
+    ))
+    op.execute(sa.text(
+        "DELETE FROM bookings WHERE booking_id NOT IN ("
+        " SELECT keep_id FROM ("
+        "  SELECT MIN(booking_id) AS keep_id FROM bookings GROUP BY slot_id"
+        " ) AS keep)"
+    ))
+    op.execute(sa.text(
+        "DELETE FROM barber_slots WHERE slot_id NOT IN ("
+        " SELECT keep_id FROM ("
+        "  SELECT COALESCE(MIN(CASE WHEN is_booked = 1 THEN slot_id END), MIN(slot_id)) AS keep_id"
+        "  FROM barber_slots GROUP BY barber_id, slot_date, slot_time"
+        " ) AS keep)"
+    ))
+    with op.batch_alter_table('barber_slots', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_barber_slot', ['barber_id', 'slot_date', 'slot_time'])
+    op.create_index('ix_barber_slots_shop_date', 'barber_slots',
+                    ['shop_id', 'slot_date', 'barber_id', 'slot_time', 'status'], unique=False)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_booking_slot', ['slot_id'])
+    op.create_index('ix_bookings_user_date', 'bookings', ['user_id', 'booking_date'], unique=False)
+    op.create_index('ix_bookings_shop_date', 'bookings', ['shop_id', 'booking_date', 'booking_time'], unique=False)
+    op.create_index('ix_bookings_barber_date', 'bookings', ['barber_id', 'booking_date'], unique=False)
+
+    op.create_index('ix_email_verification_otp_expiry', 'email_verification', ['otp_expiry'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_verification_otp_expiry', table_name='email_verification')
+
+    op.drop_index('ix_bookings_barber_date', table_name='bookings')
+    op.drop_index('ix_bookings_shop_date', table_name='bookings')
+    op.drop_index('ix_bookings_user_date', table_name='bookings')
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_booking_slot', type_='unique')
+
+    op.drop_index('ix_barber_slots_shop_date', table_name='barber_slots')
+    with op.batch_alter_table('barber_slots', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_barber_slot', type_='unique')
@@ -0,0 +1,32 @@
+"""shop listing indexes
+
+Indexes for keyset-paginated GET /shops/ filtered by city or state.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 17:52:28.073164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_shops_city_open_id', 'shops', ['city', 'is_open', 'shop_id'], unique=False)
+    op.create_index('ix_shops_state_open_id', 'shops', ['state', 'is_open', 'shop_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_shops_state_open_id', table_name='shops')
+    op.drop_index('ix_shops_city_open_id', table_name='shops')
+
@@ -0,0 +1,30 @@
+"""free slot search index
+
+Index used by GET /slots/earliest to walk free slots in time order.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 18:02:31.436654
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_barber_slots_free_time', 'barber_slots', ['is_booked', 'slot_date', 'slot_time', 'shop_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_barber_slots_free_time', table_name='barber_slots')
+
@@ -0,0 +1,29 @@
+"""email outbox retention index
+
+Index used by the email_outbox_purge job to find old sent and failed messages.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 19:12:08.527310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_email_outbox_status_created', 'email_outbox', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_email_outbox_status_created', table_name='email_outbox')
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from src.core.config import PROFILING_ENABLED
+from src.core.cache import all_cache_stats
+from src.core.profiling import profile_store
+from src.core.scheduler import job_runner
+from src.core.security import hash_pool
+from src.db.database import get_pool_stats
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/profiling/hot-routes")
+async def get_hot_routes(limit: int = Query(10, ge=1, le=100)):
+    return {"enabled": PROFILING_ENABLED, "routes": profile_store.hot_routes(limit)}
+
+@router.get("/profiling/report", response_class=PlainTextResponse)
+async def get_profile_report(route: str = Query(..., description="Route key, e.g. 'GET /shops/'")):
+    report = profile_store.report(route)
+    if report is None:
+        raise HTTPException(status_code=404, detail="No flushed profile for this route yet")
+    return report
+
+@router.get("/metrics/password-hashing")
+async def get_password_hashing_metrics():
+    return hash_pool.stats()
+
+@router.get("/metrics/db-pool")
+async def get_db_pool_metrics():
+    return get_pool_stats()
+
+@router.get("/metrics/jobs")
+async def get_job_metrics():
+    return job_runner.stats()
+
+@router.get("/metrics/caches")
+async def get_cache_metrics():
+    return all_cache_stats()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.database import get_db
 from src.schemas.barber_schemas import BarberCreate, BarberUpdate
@@ -20,4 +21,4 @@ async def delete_barber(barber_id: int, owner_id: int, db: AsyncSession = Depend
 
 @router.get("/available/{shop_id}")
 async def get_available_barbers(shop_id: int, db: AsyncSession = Depends(get_db)):
-    return await BarberService.get_available_barbers(db, shop_id)
+    return ORJSONResponse(await BarberService.get_available_barbers(db, shop_id))
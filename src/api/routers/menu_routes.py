@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from src.db.database import get_db
@@ -21,9 +21,22 @@ async def add_menu_item(menu_data: MenuCreate, db: AsyncSession = Depends(get_db
     
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/shop/{shop_id}", response_model=List[MenuResponse])
-async def get_menu(shop_id: int, db: AsyncSession = Depends(get_db)):
-    return await MenuService.get_shop_menu(db, shop_id)
+async def get_menu(shop_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    # The cached body is orjson-encoded from column rows in the MenuResponse shape and returned
+    # as-is; it is not validated through the model, which only documents the response here.
+    body, etag = await MenuService.get_shop_menu_json(db, shop_id)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.put("/update/{menu_id}", response_model=MenuResponse)
@@ -1,27 +1,80 @@
+from datetime import date, datetime
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from src.db.database import get_db
 from src.services.shop_service import ShopService
-from src.schemas.shop_schemas import ShopCreate, ShopResponse, SlotResponse, BookingRequest
+from src.schemas.shop_schemas import ShopCreate, ShopResponse, SlotResponse, EarliestSlotResponse, BookingRequest
+from src.core.config import SHOP_PAGE_SIZE_DEFAULT, SHOP_PAGE_SIZE_MAX, EARLIEST_SLOTS_DEFAULT_LIMIT, \
+    EARLIEST_SLOTS_MAX_LIMIT
 from src.core.logger import logger
 
 router = APIRouter()
 
+# Routes below that declare a response_model but return an ORJSONResponse do so on purpose: the
+# services already build exactly that shape from typed columns, so revalidating every row through
+# the model would only repeat work. The model still documents the response in the OpenAPI schema.
+
 @router.get("/shops/", response_model=List[ShopResponse])
-async def get_shops(db: AsyncSession = Depends(get_db)):
+async def get_shops(
+    limit: int = Query(SHOP_PAGE_SIZE_DEFAULT, ge=1, le=SHOP_PAGE_SIZE_MAX),
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor value from the previous page"),
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    is_open: Optional[bool] = None,
+    db: AsyncSession = Depends(get_db),
+):
     logger.info("API call: GET /shops")
-    return await ShopService.get_shops_for_user(db)
+    shops, next_cursor = await ShopService.get_shops_for_user(db, limit, cursor, city, state, is_open)
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    return ORJSONResponse(shops, headers=headers)
 
 @router.get("/shops/{shop_id}/slots/", response_model=List[SlotResponse])
-async def get_slots(shop_id: int, date: str = Query(..., description="Date in YYYY-MM-DD format"), db: AsyncSession = Depends(get_db)):
+async def get_slots(
+    shop_id: int,
+    date: str = Query(..., description="Date in YYYY-MM-DD format"),
+    response_format: str = Query("full", alias="format", pattern="^(full|compact)$",
+                                 description="'compact' groups slots per barber with a booked bitmask"),
+    db: AsyncSession = Depends(get_db),
+):
     logger.info(f"API call: GET /shops/{shop_id}/slots")
-    return await ShopService.get_available_slots(db, shop_id, date)
+    if response_format == "compact":
+        return ORJSONResponse(await ShopService.get_available_slots_compact(db, shop_id, date))
+    return ORJSONResponse(await ShopService.get_available_slots(db, shop_id, date))
+
+@router.get("/shops/{shop_id}/slots/range")
+async def get_slots_in_range(
+    shop_id: int,
+    from_date: date = Query(..., alias="from", description="First date, YYYY-MM-DD"),
+    to_date: date = Query(..., alias="to", description="Last date (inclusive), YYYY-MM-DD"),
+    barber_id: Optional[int] = None,
+    only_available: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info(f"API call: GET /shops/{shop_id}/slots/range")
+    ShopService.validate_slot_range(from_date, to_date)
+    return StreamingResponse(
+        ShopService.stream_slot_range(db, shop_id, from_date, to_date, barber_id, only_available),
+        media_type="application/json",
+    )
+
+@router.get("/slots/earliest", response_model=List[EarliestSlotResponse])
+async def get_earliest_slots(
+    city: Optional[str] = None,
+    state: Optional[str] = None,
+    service: Optional[str] = Query(None, description="Match shops offering a menu item with this name"),
+    after: Optional[datetime] = Query(None, description="Only slots starting at or after this time; default now"),
+    limit: int = Query(EARLIEST_SLOTS_DEFAULT_LIMIT, ge=1, le=EARLIEST_SLOTS_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    logger.info("API call: GET /slots/earliest")
+    return ORJSONResponse(await ShopService.find_earliest_slots(db, limit, after, city, state, service))
 
 @router.get("/owner/{owner_id}")
 async def get_shops_by_owner(owner_id: int, db: AsyncSession = Depends(get_db)):
     logger.info(f"API call: GET /shops/owner/{owner_id}")
-    return await ShopService.get_shops_by_owner(db, owner_id)
+    return ORJSONResponse(await ShopService.get_shops_by_owner(db, owner_id))
 
 @router.post("/book-slots/")
 async def book_slots(request: BookingRequest, db: AsyncSession = Depends(get_db)):
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+
+_registry = {}
+
+
+class TTLCache:
+    """In-process cache bounded by entry count (least recently used evicted first) and age.
+
+    Meant for small, rarely changing read models; each worker holds its own copy, so writes must
+    call `invalidate` and the TTL bounds how stale other workers can get.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value):
+        self._entries[key] = (value, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key, loader):
+        """Return the cached value for `key`, or await `loader()` and cache what it returns.
+
+        Exceptions from the loader (e.g. a 404) propagate and are not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_MISSING = object()
+
+
+def all_cache_stats():
+    return [cache.stats() for cache in _registry.values()]
+
+
+def clear_all_caches():
+    for cache in _registry.values():
+        cache.clear()
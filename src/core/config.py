@@ -17,3 +17,93 @@ DATABASE_URL = f"mysql+aiomysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT
 
 SMTP_EMAIL = os.getenv("SMTP_EMAIL")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+
+SLOT_INSERT_CHUNK_SIZE = int(os.getenv("SLOT_INSERT_CHUNK_SIZE", 500))
+SLOT_HORIZON_DAYS = int(os.getenv("SLOT_HORIZON_DAYS", 14))
+SLOT_RECONCILE_INTERVAL_MINUTES = int(os.getenv("SLOT_RECONCILE_INTERVAL_MINUTES", 60))
+
+# /admin metrics and profiling endpoints (off by default: they are not authenticated)
+ADMIN_ROUTES_ENABLED = os.getenv("ADMIN_ROUTES_ENABLED", "false").lower() == "true"
+
+# Sampled request profiling (off by default)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0.01))
+PROFILING_ROUTES = [r.strip() for r in os.getenv("PROFILING_ROUTES", "").split(",") if r.strip()]
+PROFILING_FLUSH_SECONDS = int(os.getenv("PROFILING_FLUSH_SECONDS", 60))
+PROFILING_REPORT_DIR = os.getenv("PROFILING_REPORT_DIR", "logs/profiles")
+
+# bcrypt thread pool; 0 workers means min(4, CPU count)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 64))
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+
+# OTP storage: "database" (shared, survives restarts), "redis" (shared between workers) or "memory"
+# (single process only: codes are lost on restart and unknown to other workers)
+OTP_STORE_BACKEND = os.getenv("OTP_STORE_BACKEND", "database").lower()
+OTP_REDIS_URL = os.getenv("OTP_REDIS_URL", "redis://localhost:6379/0")
+OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", 600))
+
+# Expired OTP purge (database OTP store only): chunked deletes, interval adapts to the backlog
+OTP_PURGE_CHUNK_SIZE = int(os.getenv("OTP_PURGE_CHUNK_SIZE", 1000))
+OTP_PURGE_MAX_CHUNKS = int(os.getenv("OTP_PURGE_MAX_CHUNKS", 20))
+OTP_PURGE_INTERVAL_SECONDS = int(os.getenv("OTP_PURGE_INTERVAL_SECONDS", 300))
+OTP_PURGE_MIN_INTERVAL_SECONDS = int(os.getenv("OTP_PURGE_MIN_INTERVAL_SECONDS", 30))
+OTP_PURGE_MAX_INTERVAL_SECONDS = int(os.getenv("OTP_PURGE_MAX_INTERVAL_SECONDS", 1800))
+
+# GET /shops/ page sizes
+SHOP_PAGE_SIZE_DEFAULT = int(os.getenv("SHOP_PAGE_SIZE_DEFAULT", 50))
+SHOP_PAGE_SIZE_MAX = int(os.getenv("SHOP_PAGE_SIZE_MAX", 200))
+
+# Longest date range GET /shops/{shop_id}/slots/range will answer
+SLOT_RANGE_MAX_DAYS = int(os.getenv("SLOT_RANGE_MAX_DAYS", 31))
+
+# GET /slots/earliest result size
+EARLIEST_SLOTS_DEFAULT_LIMIT = int(os.getenv("EARLIEST_SLOTS_DEFAULT_LIMIT", 10))
+EARLIEST_SLOTS_MAX_LIMIT = int(os.getenv("EARLIEST_SLOTS_MAX_LIMIT", 50))
+
+# Read-through cache for shop listings
+SHOP_CACHE_TTL_SECONDS = int(os.getenv("SHOP_CACHE_TTL_SECONDS", 60))
+SHOP_CACHE_MAX_ENTRIES = int(os.getenv("SHOP_CACHE_MAX_ENTRIES", 1024))
+
+# Per-shop menu cache of serialized response bodies
+MENU_CACHE_TTL_SECONDS = int(os.getenv("MENU_CACHE_TTL_SECONDS", 300))
+MENU_CACHE_MAX_ENTRIES = int(os.getenv("MENU_CACHE_MAX_ENTRIES", 2048))
+
+# Email outbox worker
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_SECONDS", 30))
+EMAIL_OUTBOX_POLL_SECONDS = int(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 30))
+
+# Sent and failed outbox messages are deleted this long after they were queued
+EMAIL_OUTBOX_RETENTION_HOURS = int(os.getenv("EMAIL_OUTBOX_RETENTION_HOURS", 72))
+EMAIL_OUTBOX_PURGE_CHUNK_SIZE = int(os.getenv("EMAIL_OUTBOX_PURGE_CHUNK_SIZE", 1000))
+EMAIL_OUTBOX_PURGE_MAX_CHUNKS = int(os.getenv("EMAIL_OUTBOX_PURGE_MAX_CHUNKS", 20))
+EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS = int(os.getenv("EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS", 3600))
+
+# Connection pool shared by request handlers and background jobs
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_WAIT_WARN_MS = float(os.getenv("DB_POOL_WAIT_WARN_MS", 100))
+
+# SQL statement accounting per request and per job (src/db/query_stats.py). A request issuing more
+# than QUERY_STATEMENT_BUDGET statements, or any request/job repeating one statement shape at least
+# QUERY_REPEAT_THRESHOLD times (an N+1 loop), is logged as a warning; 0 disables either check.
+# QUERY_STATS_HEADERS adds X-DB-Statements / X-DB-Time-Ms to responses; meant for development.
+QUERY_STATEMENT_BUDGET = int(os.getenv("QUERY_STATEMENT_BUDGET", 25))
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", 5))
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "false").lower() == "true"
+
+# Background jobs: how many may run (and hold a pooled connection) at the same time
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", 2))
+
+# Leader election: only the worker holding the lease runs cluster-wide periodic jobs
+SCHEDULER_LEADER_ELECTION = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() == "true"
+LEADER_LEASE_SECONDS = int(os.getenv("LEADER_LEASE_SECONDS", 30))
+LEADER_RENEW_SECONDS = int(os.getenv("LEADER_RENEW_SECONDS", 10))
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import socket
+import uuid
+from src.db.database import async_session
+from src.repositories.lease_repo import LeaseRepository
+from src.core.config import LEADER_LEASE_SECONDS, LEADER_RENEW_SECONDS
+from src.core.logger import logger
+
+
+class LeaderElector:
+    """Keeps this worker's claim on a lease row so one process in the deployment acts as leader.
+
+    The lease is renewed every `renew_seconds` and lapses `ttl_seconds` after the last renewal, so
+    when the leader dies another worker takes over within one TTL. A renewal that fails for any
+    reason (lost lease, DB error) demotes this worker straight away rather than risk two leaders.
+    """
+
+    def __init__(self, name: str = "scheduler", ttl_seconds: float = LEADER_LEASE_SECONDS,
+                 renew_seconds: float = LEADER_RENEW_SECONDS, session_factory=None, holder: str = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.renew_seconds = renew_seconds
+        self.session_factory = session_factory or async_session
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._task = None
+
+    async def step(self) -> bool:
+        """Acquire or renew the lease once and return whether this worker is now the leader."""
+        try:
+            async with self.session_factory() as db:
+                leader = await LeaseRepository.try_acquire(db, self.name, self.holder, self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"[LEADER] Lease check failed for {self.holder}: {str(e)}")
+            leader = False
+
+        if leader and not self.is_leader:
+            logger.info(f"[LEADER] {self.holder} acquired the '{self.name}' lease")
+        elif self.is_leader and not leader:
+            logger.warning(f"[LEADER] {self.holder} lost the '{self.name}' lease")
+        self.is_leader = leader
+        return leader
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                async with self.session_factory() as db:
+                    await LeaseRepository.release(db, self.name, self.holder)
+                logger.info(f"[LEADER] {self.holder} released the '{self.name}' lease")
+            except Exception as e:
+                logger.error(f"[LEADER] Failed to release lease for {self.holder}: {str(e)}")
+
+    async def _run(self):
+        while True:
+            await self.step()
+            await asyncio.sleep(self.renew_seconds)
@@ -0,0 +1,149 @@
+import heapq
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import pytz
+from src.db.database import async_session
+from src.repositories.user_repo import UserRepository
+from src.core.config import OTP_STORE_BACKEND, OTP_REDIS_URL
+
+
+class OTPStore(ABC):
+    """Where one-time passwords live until they are used or expire.
+
+    `get` returns the OTP for an email, or None when there is none or it has expired; callers
+    never see expired codes, so expiry is enforced in one place. `db` is the caller's session:
+    the database backend writes through it and leaves the commit to the caller, so the OTP lands
+    in the same transaction as the rest of the request; the other backends ignore it.
+    """
+
+    @abstractmethod
+    async def set(self, email: str, otp: str, ttl_seconds: int, db=None):
+        ...
+
+    @abstractmethod
+    async def get(self, email: str, db=None):
+        ...
+
+    @abstractmethod
+    async def delete(self, email: str, db=None):
+        ...
+
+
+class MemoryOTPStore(OTPStore):
+    """In-process store; expiry is tracked with a min-heap of (expires_at, email).
+
+    Expired entries are evicted from the top of the heap on every call, so memory stays bounded
+    by the OTPs issued in the last TTL without a cleanup job. Heap entries left behind by a
+    re-sent OTP are recognised by their stale expiry and skipped. Codes are only visible to the
+    process that issued them, so use the Redis backend when running several workers.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._entries = {}
+        self._expiry_heap = []
+
+    def __len__(self):
+        self._evict_expired()
+        return len(self._entries)
+
+    async def set(self, email: str, otp: str, ttl_seconds: int, db=None):
+        self._evict_expired()
+        expires_at = self._clock() + ttl_seconds
+        self._entries[email] = (otp, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, email))
+
+    async def get(self, email: str, db=None):
+        self._evict_expired()
+        entry = self._entries.get(email)
+        return entry[0] if entry else None
+
+    async def delete(self, email: str, db=None):
+        self._entries.pop(email, None)
+
+    def _evict_expired(self):
+        now = self._clock()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, email = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(email)
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[email]
+
+
+class RedisOTPStore(OTPStore):
+    """Store backed by any client exposing redis-py's asyncio `set(key, value, ex=)`, `get` and `delete`."""
+
+    def __init__(self, client, prefix: str = "otp:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def set(self, email: str, otp: str, ttl_seconds: int, db=None):
+        await self.client.set(self.prefix + email, otp, ex=ttl_seconds)
+
+    async def get(self, email: str, db=None):
+        value = await self.client.get(self.prefix + email)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
+
+    async def delete(self, email: str, db=None):
+        await self.client.delete(self.prefix + email)
+
+
+class DatabaseOTPStore(OTPStore):
+    """The email_verification table; expired rows are removed by the delete_otps job.
+
+    Without a `db` each call runs and commits in a session of its own.
+    """
+
+    async def set(self, email: str, otp: str, ttl_seconds: int, db=None):
+        expiry_time = datetime.now(pytz.timezone("Asia/Kolkata")) + timedelta(seconds=ttl_seconds)
+        if db is not None:
+            await UserRepository.store_otp(db, email, otp, expiry_time)
+            return
+        async with async_session() as db:
+            await UserRepository.store_otp(db, email, otp, expiry_time)
+            await db.commit()
+
+    async def get(self, email: str, db=None):
+        if db is not None:
+            record = await UserRepository.get_otp_by_email(db, email)
+        else:
+            async with async_session() as db:
+                record = await UserRepository.get_otp_by_email(db, email)
+        if not record:
+            return None
+
+        kolkata_tz = pytz.timezone("Asia/Kolkata")
+        expiry_time = record.otp_expiry
+        if expiry_time.tzinfo is None:
+            expiry_time = kolkata_tz.localize(expiry_time)
+        if expiry_time < datetime.now(kolkata_tz):
+            return None
+        return record.otp_code
+
+    async def delete(self, email: str, db=None):
+        if db is not None:
+            await UserRepository.delete_otp(db, email)
+            return
+        async with async_session() as db:
+            await UserRepository.delete_otp(db, email)
+            await db.commit()
+
+
+def create_otp_store(backend: str = OTP_STORE_BACKEND) -> OTPStore:
+    if backend == "memory":
+        return MemoryOTPStore()
+    if backend == "database":
+        return DatabaseOTPStore()
+    if backend == "redis":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("OTP_STORE_BACKEND=redis requires the 'redis' package") from e
+        return RedisOTPStore(redis_asyncio.from_url(OTP_REDIS_URL))
+    raise ValueError(f"Unknown OTP_STORE_BACKEND: {backend}")
+
+
+otp_store = create_otp_store()
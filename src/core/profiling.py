@@ -0,0 +1,114 @@
+import asyncio
+import os
+import random
+import re
+import time
+
+from fastapi import Request
+from pyinstrument import Profiler
+from pyinstrument.renderers import ConsoleRenderer
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.core.config import (
+    PROFILING_SAMPLE_RATE, PROFILING_ROUTES, PROFILING_REPORT_DIR
+)
+from src.core.logger import logger
+
+
+def should_profile(path: str) -> bool:
+    """Profile every request under a configured route prefix, and a random sample of the rest."""
+    if any(path.startswith(prefix) for prefix in PROFILING_ROUTES):
+        return True
+    return random.random() < PROFILING_SAMPLE_RATE
+
+
+class RouteProfileStore:
+    """Per-route profiling data kept in memory.
+
+    Sampled sessions for a route are merged into one call tree until the next flush, which renders
+    them to text off the event loop. Running totals per route drive the hot-route ranking.
+    """
+
+    def __init__(self, report_dir: str = PROFILING_REPORT_DIR):
+        self.report_dir = report_dir
+        self._stats = {}
+        self._pending = {}
+        self._reports = {}
+
+    def record(self, route: str, session, duration_ms: float):
+        stats = self._stats.setdefault(route, {"route": route, "samples": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["samples"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+        pending = self._pending.get(route)
+        self._pending[route] = session if pending is None else pending.combine(pending, session)
+
+    def hot_routes(self, limit: int = 10):
+        ranked = sorted(self._stats.values(), key=lambda s: s["total_ms"], reverse=True)[:limit]
+        return [
+            {
+                "route": s["route"],
+                "samples": s["samples"],
+                "total_ms": round(s["total_ms"], 2),
+                "avg_ms": round(s["total_ms"] / s["samples"], 2),
+                "max_ms": round(s["max_ms"], 2),
+            } for s in ranked
+        ]
+
+    def report(self, route: str):
+        return self._reports.get(route)
+
+    async def flush(self):
+        """Render and write the call trees merged since the last flush; returns the routes written."""
+        pending, self._pending = self._pending, {}
+        for route, session in pending.items():
+            self._reports[route] = await asyncio.to_thread(self._write_report, route, session)
+        return list(pending)
+
+    def _write_report(self, route: str, session) -> str:
+        text = ConsoleRenderer(unicode=True).render(session)
+        os.makedirs(self.report_dir, exist_ok=True)
+        filename = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") + ".txt"
+        with open(os.path.join(self.report_dir, filename), "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+
+profile_store = RouteProfileStore()
+
+
+class SamplingProfilerMiddleware(BaseHTTPMiddleware):
+    """Profile a sample of requests with pyinstrument and aggregate the results per route."""
+
+    async def dispatch(self, request: Request, call_next):
+        if not should_profile(request.url.path):
+            return await call_next(request)
+
+        profiler = Profiler()
+        try:
+            profiler.start()
+        except RuntimeError:
+            # Another sampled request already owns the profiler in this context.
+            return await call_next(request)
+
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            session = profiler.stop()
+
+        route = request.scope.get("route")
+        if route is not None:
+            profile_store.record(
+                f"{request.method} {route.path}", session, (time.perf_counter() - started) * 1000
+            )
+        return response
+
+
+async def flush_profiles():
+    """Write merged reports for routes sampled since the last flush; run periodically by the job runner."""
+    routes = await profile_store.flush()
+    if routes:
+        logger.info(f"[PROFILING] Wrote reports for {len(routes)} routes")
+    return routes
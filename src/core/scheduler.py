@@ -1,37 +1,231 @@
-from apscheduler.schedulers.background import BackgroundScheduler
+import asyncio
+import random
+import time
 from fastapi import FastAPI
 from src.jobs.otp_cleanup import delete_expired_otps
-from src.jobs.slot_generator import generate_barber_slots
+from src.jobs.slot_generator import generate_barber_slots, refresh_barber_slots
+from src.jobs.email_outbox import deliver_email_outbox, purge_email_outbox
+from src.core.config import SLOT_RECONCILE_INTERVAL_MINUTES, EMAIL_OUTBOX_POLL_SECONDS, PROFILING_ENABLED, \
+    PROFILING_FLUSH_SECONDS, JOB_MAX_CONCURRENCY, SCHEDULER_LEADER_ELECTION, \
+    OTP_PURGE_INTERVAL_SECONDS, OTP_STORE_BACKEND, EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS
+from src.core.leader import LeaderElector
+from src.core.profiling import flush_profiles
 from src.core.logger import logger
+from src.db.query_stats import check_query_stats, track_queries
+
+
+class Job:
+    """A coroutine function run every `interval` seconds by the AsyncJobRunner."""
+
+    def __init__(self, job_id: str, func, interval: float, jitter: float = 0, timeout: float = None,
+                 leader_only: bool = False):
+        self.job_id = job_id
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.leader_only = leader_only
+        self.lock = asyncio.Lock()
+        self.rerun_requested = False
+        self.runs = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.last_duration_ms = None
+        self.last_error = None
+        self.last_queries = None
+        self.next_delay = None
+
+    def stats(self):
+        return {
+            "job_id": self.job_id,
+            "interval_seconds": self.interval,
+            "leader_only": self.leader_only,
+            "running": self.lock.locked(),
+            "runs": self.runs,
+            "failures": self.failures,
+            "coalesced": self.coalesced,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+            "last_queries": self.last_queries,
+            "next_delay_seconds": self.next_delay,
+        }
+
+
+class AsyncJobRunner:
+    """Runs periodic and one-off jobs as asyncio tasks on the application's event loop.
+
+    Jobs share the app's async engine and pool instead of a second sync driver and thread pool.
+    A job never overlaps with itself: a trigger that arrives mid-run is folded into one follow-up
+    run, and intervals missed while a run overran are coalesced into a single catch-up run.
+    A job may return a dict with `next_run_in` (seconds) to pick its own next delay instead of
+    `interval`. Each run is delayed by up to `jitter` seconds and cancelled after `timeout` seconds, and at
+    most `max_concurrency` jobs hold a connection at once so they can't starve request handlers.
+    With a `leader` elector, `leader_only` jobs are skipped on every worker but the current leader.
+    """
+
+    def __init__(self, max_concurrency: int = JOB_MAX_CONCURRENCY, leader: LeaderElector = None):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.leader = leader
+        self._jobs = {}
+        self._tasks = set()
+        self._adhoc = {}
+        self._started = False
+
+    def add_job(self, job_id: str, func, interval: float, jitter: float = 0, timeout: float = None,
+                leader_only: bool = False):
+        self._jobs[job_id] = Job(job_id, func, interval, jitter, timeout, leader_only)
+
+    def is_leader(self) -> bool:
+        return self.leader is None or self.leader.is_leader
+
+    def start(self):
+        self._started = True
+        if self.leader is not None:
+            self.leader.start()
+        for job in self._jobs.values():
+            self._spawn(self._schedule(job))
+
+    async def shutdown(self):
+        self._started = False
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._adhoc.clear()
+        if self.leader is not None:
+            await self.leader.stop()
+
+    def trigger(self, job_id: str):
+        """Run a registered job now, or once more right after the run in progress."""
+        job = self._jobs.get(job_id)
+        if not self._started or job is None or (job.leader_only and not self.is_leader()):
+            return
+        if job.lock.locked():
+            job.rerun_requested = True
+            return
+        self._spawn(self._execute(job))
+
+    def submit(self, key: str, func, *args, timeout: float = None):
+        """Run a one-off coroutine in the background; submissions with the same key never overlap."""
+        if not self._started:
+            return
+        job = self._adhoc.get(key)
+        if job is None:
+            job = self._adhoc[key] = Job(key, lambda: func(*args), interval=0, timeout=timeout)
+        else:
+            job.func = lambda: func(*args)
+        if job.lock.locked():
+            job.rerun_requested = True
+            return
+        self._spawn(self._execute(job, adhoc=True))
+
+    def stats(self):
+        return {
+            "leader": self.is_leader(),
+            "holder": self.leader.holder if self.leader is not None else None,
+            "jobs": [job.stats() for job in self._jobs.values()],
+        }
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _schedule(self, job: Job):
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + job.interval
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()) + random.uniform(0, job.jitter))
+            if job.leader_only and not self.is_leader():
+                next_run = loop.time() + job.interval
+                continue
+            await self._execute(job)
+
+            if job.next_delay is not None:
+                next_run = loop.time() + job.next_delay
+                continue
+            next_run += job.interval
+            now = loop.time()
+            if next_run < now:
+                missed = int((now - next_run) // job.interval) + 1
+                job.coalesced += missed
+                logger.warning(f"[JOB {job.job_id}] Run overran, coalescing {missed} missed run(s)")
+                next_run = now
+
+    async def _execute(self, job: Job, adhoc: bool = False):
+        if job.lock.locked():
+            job.rerun_requested = True
+            return
+        async with job.lock:
+            while True:
+                job.rerun_requested = False
+                started = time.perf_counter()
+                with track_queries() as queries:
+                    try:
+                        async with self._semaphore:
+                            result = await asyncio.wait_for(job.func(), timeout=job.timeout)
+                        job.next_delay = result.get("next_run_in") if isinstance(result, dict) else None
+                        job.last_error = None
+                    except asyncio.TimeoutError:
+                        job.failures += 1
+                        job.next_delay = None
+                        job.last_error = f"timed out after {job.timeout}s"
+                        logger.error(f"[JOB {job.job_id}] Timed out after {job.timeout}s")
+                    except Exception as e:
+                        job.failures += 1
+                        job.next_delay = None
+                        job.last_error = str(e)
+                        logger.error(f"[JOB {job.job_id}] Failed: {str(e)}")
+                job.runs += 1
+                job.last_queries = queries.as_dict()
+                # Jobs are batch work, so only repeated statements are flagged, not the total
+                check_query_stats(f"job {job.job_id}", queries, budget=0)
+                job.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                if not job.rerun_requested:
+                    break
+        if adhoc and not job.rerun_requested:
+            self._adhoc.pop(job.job_id, None)
+
+
+job_runner = AsyncJobRunner(leader=LeaderElector("scheduler") if SCHEDULER_LEADER_ELECTION else None)
 
-scheduler = BackgroundScheduler()
 
 def start_scheduler(app: FastAPI):
     try:
-        scheduler.add_job(
-            delete_expired_otps,
-            "interval",
-            minutes=5,
-            id="delete_otps",
-            replace_existing=True
-        )
-
-        scheduler.add_job(
-            generate_barber_slots,
-            "interval",
-            minutes=60,
-            id="slot_agent",
-            replace_existing=True
-        )
-
-        scheduler.start()
-        logger.info(" Scheduler started: OTP cleanup + Slot generator running")
+        # Cluster-wide maintenance runs on the elected leader only; the outbox claims messages
+        # safely from any worker and profiles are per-process, so those run everywhere.
+        if OTP_STORE_BACKEND == "database":
+            job_runner.add_job("delete_otps", delete_expired_otps, interval=OTP_PURGE_INTERVAL_SECONDS,
+                               jitter=15, timeout=120, leader_only=True)
+        job_runner.add_job("slot_agent", generate_barber_slots, interval=SLOT_RECONCILE_INTERVAL_MINUTES * 60,
+                           jitter=60, timeout=10 * 60, leader_only=True)
+        job_runner.add_job("email_outbox", deliver_email_outbox, interval=EMAIL_OUTBOX_POLL_SECONDS, jitter=2,
+                           timeout=5 * 60)
+        job_runner.add_job("email_outbox_purge", purge_email_outbox, interval=EMAIL_OUTBOX_PURGE_INTERVAL_SECONDS,
+                           jitter=60, timeout=5 * 60, leader_only=True)
+        if PROFILING_ENABLED:
+            job_runner.add_job("profile_flush", flush_profiles, interval=PROFILING_FLUSH_SECONDS, timeout=60)
+
+        job_runner.start()
+        logger.info(" Scheduler started: OTP cleanup + Slot generator + Email outbox running")
     except Exception as e:
         logger.error(f" Failed to start scheduler: {str(e)}")
 
-def shutdown_scheduler():
+async def shutdown_scheduler():
     try:
-        scheduler.shutdown()
+        await job_runner.shutdown()
         logger.info("Scheduler shutdown successfully.")
     except Exception as e:
         logger.error(f" Error while shutting down scheduler: {str(e)}")
+
+def enqueue_barber_slot_refresh(barber_id: int):
+    """Refresh a single barber's slots in the background.
+
+    Refreshes are keyed per barber, so bursts of updates for the same barber collapse into one
+    follow-up run instead of overlapping.
+    """
+    job_runner.submit(f"slot_refresh_{barber_id}", refresh_barber_slots, barber_id, timeout=60)
+    logger.info(f"Queued slot refresh for barber {barber_id}")
+
+def wake_email_outbox():
+    job_runner.trigger("email_outbox")
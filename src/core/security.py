@@ -1,4 +1,12 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
 from passlib.context import CryptContext
+from src.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+from src.core.logger import logger
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -7,3 +15,79 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class BoundedHashPool:
+    """Thread pool for bcrypt work with a bounded wait queue.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism without blocking the
+    event loop. Once `workers + max_queue` calls are in flight new calls are rejected with a 503
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._max_wait_ms = 0.0
+        self._latencies_ms = deque(maxlen=1000)
+
+    async def run(self, fn, *args):
+        if self._in_flight >= self.workers + self.max_queue:
+            self._rejected += 1
+            logger.warning(f"[PASSWORD HASHING] Pool saturated ({self._in_flight} in flight), rejecting request")
+            raise HTTPException(status_code=503, detail="Server busy, please retry shortly",
+                                headers={"Retry-After": "1"})
+
+        self._in_flight += 1
+        submitted = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        def job():
+            return time.perf_counter(), fn(*args)
+
+        future = self._executor.submit(job)
+        # Released when the thread finishes, not when the caller stops waiting: a request that is
+        # cancelled mid-hash (client disconnect) leaves its bcrypt call running in the pool.
+        future.add_done_callback(lambda _: self._release_soon(loop))
+        started, result = await asyncio.wrap_future(future)
+
+        self._completed += 1
+        self._max_wait_ms = max(self._max_wait_ms, (started - submitted) * 1000)
+        self._latencies_ms.append((time.perf_counter() - submitted) * 1000)
+        return result
+
+    def _release_soon(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed at shutdown; nothing left to account for
+
+    def _release(self):
+        self._in_flight -= 1
+
+    def stats(self):
+        latencies = sorted(self._latencies_ms)
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.workers),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else 0.0,
+            "max_wait_ms": round(self._max_wait_ms, 2),
+        }
+
+
+hash_pool = BoundedHashPool(PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1), PASSWORD_HASH_MAX_QUEUE)
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.run(verify_password, plain_password, hashed_password)
@@ -1,19 +1,43 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import create_engine
-from src.core.config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.core.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    DB_POOL_WAIT_WARN_MS
+)
+from src.db.pool_metrics import PoolMetrics, instrumented_pool
+from src.db.query_stats import instrument_engine
 from src.core.logger import logger
 
 Base = declarative_base()
 
-# Async setup for FastAPI routes
-engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+# Async setup shared by FastAPI routes and background jobs
+pool_metrics = PoolMetrics("api", DB_POOL_WAIT_WARN_MS)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    poolclass=instrumented_pool(AsyncAdaptedQueuePool, pool_metrics),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
-
-# Sync setup for background jobs (APScheduler, scripts)
-sync_engine = create_engine(DATABASE_URL.replace("+aiomysql", "+pymysql"), echo=False)
-SessionLocal = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False)
+instrument_engine(engine.sync_engine)
 
 async def get_db():
+    """One session per request. Repositories only flush; the service commits once when its work is done.
+
+    Anything left uncommitted (including after an exception) is rolled back when the session closes.
+    """
     async with async_session() as session:
-        yield session
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+def get_pool_stats():
+    return [pool_metrics.snapshot(engine.pool)]
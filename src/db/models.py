@@ -1,4 +1,4 @@
-from sqlalchemy import Column,UniqueConstraint, Integer, String, DateTime, Date, Time, Boolean, Text, ForeignKey, DECIMAL, Enum
+from sqlalchemy import Column,UniqueConstraint, Index, Integer, String, DateTime, Date, Time, Boolean, Text, ForeignKey, DECIMAL, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.db.database import Base
@@ -37,6 +37,12 @@ class Shop(Base):
     barbers = relationship("Barber", back_populates="shop", cascade="all, delete")
     menu_items = relationship("Menu", back_populates="shop", cascade="all, delete")
 
+    __table_args__ = (
+        # Keyset pages of GET /shops/ filtered by city or state (optionally is_open), in shop_id order
+        Index("ix_shops_city_open_id", "city", "is_open", "shop_id"),
+        Index("ix_shops_state_open_id", "state", "is_open", "shop_id"),
+    )
+
 
 
 class Barber(Base):
@@ -51,7 +57,8 @@ class Barber(Base):
     generate_daily = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     shop = relationship("Shop", back_populates="barbers")
-    slots = relationship("BarberSlot", back_populates="barber", cascade="all, delete")
+    # barber_slots.barber_id is ON DELETE CASCADE, so deleting a barber leaves its slots to the database
+    slots = relationship("BarberSlot", back_populates="barber", cascade="all, delete", passive_deletes=True)
     availability = relationship("BarberAvailability", back_populates="barber", cascade="all, delete")
 
 
@@ -71,6 +78,15 @@ class BarberSlot(Base):
 
     barber = relationship("Barber", back_populates="slots")
 
+    __table_args__ = (
+        # One slot per barber and start time; lets the slot generator use insert-ignore.
+        UniqueConstraint("barber_id", "slot_date", "slot_time", name="uq_barber_slot"),
+        # Covers the per-day slot listing: filter (shop_id, slot_date), order (barber_id, slot_time).
+        Index("ix_barber_slots_shop_date", "shop_id", "slot_date", "barber_id", "slot_time", "status"),
+        # Cross-shop earliest-opening search: walk free slots in time order and stop after K matches.
+        Index("ix_barber_slots_free_time", "is_booked", "slot_date", "slot_time", "shop_id"),
+    )
+
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -91,6 +107,13 @@ class Booking(Base):
     shop = relationship("Shop")
     slot = relationship("BarberSlot")
 
+    __table_args__ = (
+        UniqueConstraint("slot_id", name="uq_booking_slot"),
+        Index("ix_bookings_user_date", "user_id", "booking_date"),
+        Index("ix_bookings_shop_date", "shop_id", "booking_date", "booking_time"),
+        Index("ix_bookings_barber_date", "barber_id", "booking_date"),
+    )
+
 from sqlalchemy import (
     Column, Integer, String, Boolean, ForeignKey, Time, Date, DateTime, Text, UniqueConstraint
 )
@@ -107,7 +130,40 @@ class EmailVerification(Base):
     email = Column(String(150), unique=True, nullable=False)
     otp_code = Column(String(10), nullable=False)
     otp_expiry = Column(DateTime, nullable=False)
-    
+
+    __table_args__ = (
+        Index("ix_email_verification_otp_expiry", "otp_expiry"),
+    )
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    recipient = Column(String(150), nullable=False)
+    subject = Column(String(200), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), default="pending")  # pending / sending / sent / failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    claim_token = Column(String(32), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_email_outbox_status_created", "status", "created_at"),
+    )
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    acquired_at = Column(DateTime, default=datetime.utcnow)
+
 class BarberAvailability(Base):
     __tablename__ = "barber_availability"
 
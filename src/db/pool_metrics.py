@@ -0,0 +1,70 @@
+import threading
+import time
+from sqlalchemy import exc
+from src.core.logger import logger
+
+
+class PoolMetrics:
+    """Checkout counters and connection wait times for one engine's pool."""
+
+    def __init__(self, name: str, wait_warn_ms: float):
+        self.name = name
+        self.wait_warn_ms = wait_warn_ms
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.slow_waits = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait_ms += wait_ms
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            slow = wait_ms >= self.wait_warn_ms
+            if slow:
+                self.slow_waits += 1
+        if slow:
+            logger.warning(f"[DB POOL] {self.name}: waited {wait_ms:.1f} ms for a connection"
+                           f"{' and timed out' if timed_out else ''}")
+
+    def snapshot(self, pool):
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "slow_waits": self.slow_waits,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+def instrumented_pool(base, metrics: PoolMetrics):
+    """Subclass a QueuePool variant so every checkout reports how long it waited for a connection.
+
+    A subclass (rather than pool events) is used because events only fire once a connection has
+    been handed out, which hides the time spent queueing for it.
+    """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+                raise
+            metrics.record_wait((time.perf_counter() - started) * 1000)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
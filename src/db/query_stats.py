@@ -0,0 +1,138 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from src.core.config import QUERY_STATEMENT_BUDGET, QUERY_REPEAT_THRESHOLD, QUERY_STATS_HEADERS
+from src.core.logger import logger
+
+_current_stats = ContextVar("query_stats", default=None)
+
+# Expanded IN lists and multi-row VALUES differ only in their placeholder count
+_PLACEHOLDER_RUN = re.compile(r"(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL text with whitespace and placeholder lists collapsed, so repeats of one query compare equal."""
+    return _PLACEHOLDER_RUN.sub("?", _WHITESPACE.sub(" ", statement)).strip()
+
+
+class QueryStats:
+    """Database round trips made while a request (or other unit of work) was running."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.db_time_ms = 0.0
+        self.shapes = Counter()
+
+    def as_dict(self):
+        return {"statements": self.statements, "commits": self.commits, "rollbacks": self.rollbacks,
+                "db_time_ms": round(self.db_time_ms, 2)}
+
+    def repeated_shapes(self, threshold: int):
+        """Statement shapes issued at least `threshold` times, most repeated first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+@contextmanager
+def track_queries():
+    """Count statements and transaction ends issued inside the block, including in awaited code."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats():
+    return _current_stats.get()
+
+
+def check_query_stats(label: str, stats: QueryStats, budget: int = QUERY_STATEMENT_BUDGET,
+                      repeat_threshold: int = QUERY_REPEAT_THRESHOLD):
+    """Log (and return) warnings for a unit of work over its statement budget or repeating a statement."""
+    warnings = []
+    if budget and stats.statements > budget:
+        warnings.append(f"{label} issued {stats.statements} statements, over the budget of {budget}")
+    if repeat_threshold:
+        for shape, count in stats.repeated_shapes(repeat_threshold):
+            warnings.append(f"{label} ran the same statement {count} times (N+1?): {shape[:200]}")
+    for message in warnings:
+        logger.warning(f"[DB] {message}")
+    return warnings
+
+
+def _on_before_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.shapes[statement_shape(statement)] += 1
+        context._query_stats_started = time.perf_counter()
+
+
+def _on_after_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is not None and started is not None:
+        stats.db_time_ms += (time.perf_counter() - started) * 1000
+
+
+def _on_commit(conn):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def _on_rollback(conn):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.rollbacks += 1
+
+
+def instrument_engine(sync_engine):
+    """Attach the counters to an Engine (for an AsyncEngine pass its `.sync_engine`)."""
+    event.listen(sync_engine, "before_cursor_execute", _on_before_execute)
+    event.listen(sync_engine, "after_cursor_execute", _on_after_execute)
+    event.listen(sync_engine, "commit", _on_commit)
+    event.listen(sync_engine, "rollback", _on_rollback)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware that logs the statements, commits and DB time of every HTTP request.
+
+    Requests over the statement budget or repeating a statement shape are logged as warnings.
+    With `headers` on, the counts so far are also sent as X-DB-Statements / X-DB-Time-Ms; a
+    streamed response sends its headers before the body's queries have run.
+    """
+
+    def __init__(self, app, headers: bool = QUERY_STATS_HEADERS):
+        self.app = app
+        self.headers = headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    response_headers = MutableHeaders(scope=message)
+                    response_headers["X-DB-Statements"] = str(stats.statements)
+                    response_headers["X-DB-Time-Ms"] = f"{stats.db_time_ms:.1f}"
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats if self.headers else send)
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                label = f"{scope['method']} {scope['path']}"
+                logger.info(f"[DB] {label}: {stats.statements} statements, {stats.commits} commits, "
+                            f"{stats.db_time_ms:.1f} ms in DB of {elapsed_ms:.1f} ms")
+                check_query_stats(label, stats)
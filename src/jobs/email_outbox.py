@@ -0,0 +1,103 @@
+import asyncio
+import smtplib
+import time
+from datetime import datetime, timedelta
+from src.db.database import async_session
+from src.repositories.outbox_repo import EmailOutboxRepository
+from src.utils.smtp import SMTPMailer
+from src.core.config import (
+    EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS, EMAIL_OUTBOX_RETENTION_HOURS,
+    EMAIL_OUTBOX_PURGE_CHUNK_SIZE, EMAIL_OUTBOX_PURGE_MAX_CHUNKS
+)
+from src.core.logger import logger
+
+
+async def drain_email_outbox(mailer: SMTPMailer, batch_size: int = EMAIL_OUTBOX_BATCH_SIZE):
+    """Deliver due outbox messages in batches over `mailer`'s connection until none are left.
+
+    Returns the number of messages sent and failed during this drain. If the SMTP server can't be
+    reached, the claimed batch is marked failed (so it backs off and counts towards
+    EMAIL_OUTBOX_MAX_ATTEMPTS) and the drain stops until the next run.
+    """
+    sent = failed = 0
+    unreachable = False
+    while True:
+        async with async_session() as db:
+            batch = await EmailOutboxRepository.claim_batch(db, batch_size)
+            if not batch:
+                break
+
+            try:
+                results = await asyncio.to_thread(
+                    mailer.send_batch, [(m.id, m.recipient, m.subject, m.body) for m in batch]
+                )
+            except (OSError, smtplib.SMTPException) as e:
+                logger.error(f"[EMAIL OUTBOX] SMTP connection failed: {e}")
+                error = str(e) or type(e).__name__
+                results = {m.id: error for m in batch}
+                unreachable = True
+
+            delivered = [m.id for m in batch if results.get(m.id) is None]
+            if delivered:
+                await EmailOutboxRepository.mark_sent(db, delivered)
+            for message in batch:
+                if results.get(message.id) is not None:
+                    await EmailOutboxRepository.mark_failed(
+                        db, message, results[message.id], EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_RETRY_SECONDS
+                    )
+            await db.commit()
+
+            sent += len(delivered)
+            failed += len(batch) - len(delivered)
+            if unreachable or len(batch) < batch_size:
+                break
+
+    if sent or failed:
+        logger.info(f"[EMAIL OUTBOX] Sent {sent} emails, {failed} failed")
+    return {"sent": sent, "failed": failed}
+
+
+# One SMTP connection per process, kept open across drains and closed on shutdown
+mailer = SMTPMailer()
+
+
+async def deliver_email_outbox():
+    """Periodic job: drain the outbox over the shared connection.
+
+    Requests trigger an immediate run after queueing an OTP; the interval picks up retries and
+    anything queued by other processes.
+    """
+    return await drain_email_outbox(mailer)
+
+
+async def purge_email_outbox(chunk_size: int = EMAIL_OUTBOX_PURGE_CHUNK_SIZE,
+                             max_chunks: int = EMAIL_OUTBOX_PURGE_MAX_CHUNKS):
+    """Delete sent and failed messages older than EMAIL_OUTBOX_RETENTION_HOURS, `chunk_size` rows per transaction.
+
+    A run stops after `max_chunks` chunks; the rest is picked up by the next run. A failing chunk
+    is rolled back and the error re-raised so the job runner records the run as failed.
+    """
+    started = time.perf_counter()
+    cutoff = datetime.utcnow() - timedelta(hours=EMAIL_OUTBOX_RETENTION_HOURS)
+    deleted = chunks = 0
+    while chunks < max_chunks:
+        async with async_session() as db:
+            try:
+                removed = await EmailOutboxRepository.purge_finished(db, cutoff, chunk_size)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"[EMAIL OUTBOX ERROR] Purge failed: {str(e)} (after deleting {deleted} messages)")
+                raise
+        deleted += removed
+        chunks += 1
+        if removed < chunk_size:
+            break
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"[EMAIL OUTBOX] Purged {deleted} finished messages in {chunks} chunks ({elapsed_ms} ms)")
+    return {"deleted": deleted, "chunks": chunks, "elapsed_ms": elapsed_ms}
+
+
+async def close_mailer():
+    await asyncio.to_thread(mailer.close)
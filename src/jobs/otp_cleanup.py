@@ -1,18 +1,56 @@
-from datetime import datetime, timedelta
-from src.db.database import SessionLocal
-from src.db.models import EmailVerification
+import time
+from datetime import datetime
+import pytz
+from src.db.database import async_session
+from src.repositories.user_repo import UserRepository
+from src.core.config import (
+    OTP_PURGE_CHUNK_SIZE, OTP_PURGE_MAX_CHUNKS, OTP_PURGE_INTERVAL_SECONDS, OTP_PURGE_MIN_INTERVAL_SECONDS,
+    OTP_PURGE_MAX_INTERVAL_SECONDS
+)
 from src.core.logger import logger
 
-def delete_expired_otps():
-    """Delete expired OTPs older than 5 minutes."""
-    db = SessionLocal()
-    try:
-        expiration_time = datetime.utcnow() - timedelta(minutes=5)
-        deleted_count = db.query(EmailVerification).filter(EmailVerification.created_at < expiration_time).delete()
-        db.commit()
-        logger.info(f"[OTP CLEANUP] Deleted {deleted_count} expired OTP records")
-    except Exception as e:
-        db.rollback()
-        logger.error(f"[OTP CLEANUP ERROR] {str(e)}")
-    finally:
-        db.close()
+
+def _next_interval(deleted: int, backlog: bool) -> int:
+    """Come back sooner while a backlog remains and back off while there is nothing to purge."""
+    if backlog:
+        return OTP_PURGE_MIN_INTERVAL_SECONDS
+    if deleted == 0:
+        return OTP_PURGE_MAX_INTERVAL_SECONDS
+    return OTP_PURGE_INTERVAL_SECONDS
+
+
+async def delete_expired_otps(chunk_size: int = OTP_PURGE_CHUNK_SIZE, max_chunks: int = OTP_PURGE_MAX_CHUNKS):
+    """Delete OTP records whose otp_expiry has passed, `chunk_size` rows per transaction.
+
+    A run stops after `max_chunks` chunks so a large backlog never holds the job (or locks) for
+    long; the returned `next_run_in` brings the next run forward until the backlog is cleared.
+    A failing chunk is rolled back and the error re-raised so the job runner records the run as
+    failed; chunks committed before it stay deleted.
+    """
+    started = time.perf_counter()
+    # otp_expiry is stored as naive Asia/Kolkata wall time (see UserService.send_verification_otp)
+    cutoff = datetime.now(pytz.timezone("Asia/Kolkata")).replace(tzinfo=None)
+    deleted = chunks = 0
+    backlog = False
+    while chunks < max_chunks:
+        async with async_session() as db:
+            try:
+                removed = await UserRepository.purge_expired_otps(db, cutoff, chunk_size)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"[OTP CLEANUP ERROR] {str(e)} (after deleting {deleted} records)")
+                raise
+        deleted += removed
+        chunks += 1
+        if removed < chunk_size:
+            break
+    else:
+        backlog = True
+
+    next_run_in = _next_interval(deleted, backlog)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    logger.info(f"[OTP CLEANUP] Deleted {deleted} expired OTP records in {chunks} chunks ({elapsed_ms} ms), "
+                f"next run in {next_run_in}s")
+    return {"deleted": deleted, "chunks": chunks, "backlog": backlog, "elapsed_ms": elapsed_ms,
+            "next_run_in": next_run_in}
@@ -1,75 +1,264 @@
+import time
 from datetime import datetime, timedelta
-from src.db.database import SessionLocal
-from src.db.models import Barber, BarberSlot, Shop
+from sqlalchemy import delete, insert, or_, select
+from src.db.database import async_session
+from src.db.models import Barber, BarberAvailability, BarberSlot, Shop
+from src.core.config import SLOT_INSERT_CHUNK_SIZE, SLOT_HORIZON_DAYS
 from src.core.logger import logger
 
-def generate_barber_slots(single_barber_id: int = None):
-    """Generate 1-hour slots for barbers directly from barbers table with fixed time intervals."""
-    db = SessionLocal()
-    try:
-        today = datetime.today().date()
-        now_dt = datetime.now()
-        slot_duration = timedelta(hours=1)
+SLOT_DURATION = timedelta(hours=1)
+
+
+def _iter_slot_times(slot_date, start_time, end_time, now_dt):
+    """Yield start times of the 1-hour slots that fit in the working hours and have not already ended."""
+    current_slot_start = datetime.combine(slot_date, start_time)
+    end_dt = datetime.combine(slot_date, end_time)
+
+    while current_slot_start + SLOT_DURATION <= end_dt:
+        if current_slot_start + SLOT_DURATION > now_dt:
+            yield current_slot_start.time()
+        current_slot_start += SLOT_DURATION
 
-        query = db.query(Barber).filter(
-            Barber.generate_daily == True,
-            Barber.is_available == True
-        )
-        if single_barber_id:
-            query = query.filter(Barber.barber_id == single_barber_id)
 
-        barbers = query.all()
+def _working_hours(barber, slot_date, overrides):
+    """Return (start_time, end_time) for a barber on a date, or None when it is a day off.
 
-        if not barbers:
-            logger.info("[SLOT AGENT] No barbers found for slot generation")
-            return
+    A BarberAvailability row for the date wins over the barber's default hours; missing
+    start/end times on the override fall back to the defaults.
+    """
+    override = overrides.get((barber.barber_id, slot_date))
+    if override is None:
+        return barber.start_time, barber.end_time
+    if override.is_available is False:
+        return None
+    return override.start_time or barber.start_time, override.end_time or barber.end_time
 
-        for barber in barbers:
-            shop = db.query(Shop).filter(Shop.shop_id == barber.shop_id).first()
-            if not shop or not getattr(shop, "is_open", True):
-                logger.info(f"[SLOT AGENT] Shop closed. Skipping {barber.barber_name}.")
+
+def _missing_slots(barbers, existing, slot_dates, now_dt, overrides=None):
+    """Build insert rows for every slot of `barbers` on `slot_dates` not present in `existing`.
+
+    `existing` is a set of (barber_id, slot_date, slot_time) tuples already stored in the DB and
+    `overrides` maps (barber_id, date) to the BarberAvailability row for that day.
+    """
+    overrides = overrides or {}
+    rows = []
+    for barber in barbers:
+        for slot_date in slot_dates:
+            hours = _working_hours(barber, slot_date, overrides)
+            if hours is None:
                 continue
+            for slot_time in _iter_slot_times(slot_date, hours[0], hours[1], now_dt):
+                if (barber.barber_id, slot_date, slot_time) in existing:
+                    continue
+                rows.append({
+                    "barber_id": barber.barber_id,
+                    "shop_id": barber.shop_id,
+                    "slot_date": slot_date,
+                    "slot_time": slot_time,
+                    "status": "available",
+                    "is_booked": False,
+                })
+    return rows
+
+
+def _slot_window(now_dt):
+    """Return the dates covered by the rolling slot horizon starting today."""
+    today = now_dt.date()
+    return [today + timedelta(days=offset) for offset in range(SLOT_HORIZON_DAYS)]
+
+
+async def _load_overrides(db, barber_ids, first_date, last_date):
+    """Load BarberAvailability rows for `barber_ids` in the window, keyed by (barber_id, date)."""
+    query = select(
+        BarberAvailability.barber_id, BarberAvailability.available_date, BarberAvailability.start_time,
+        BarberAvailability.end_time, BarberAvailability.is_available
+    ).filter(
+        BarberAvailability.barber_id.in_(barber_ids),
+        BarberAvailability.available_date.between(first_date, last_date)
+    )
+    return {(row.barber_id, row.available_date): row for row in (await db.execute(query)).all()}
+
+
+def _insert_ignore(db):
+    """INSERT for barber_slots that silently skips rows already covered by uq_barber_slot."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        return insert(BarberSlot).prefix_with("IGNORE")
+    if dialect == "sqlite":
+        return insert(BarberSlot).prefix_with("OR IGNORE")
+    return insert(BarberSlot)
+
+
+async def _insert_slots(db, rows):
+    """Write rows in chunked multi-row INSERTs; returns how many rows were actually inserted.
+
+    Overlapping runs (the periodic scan and a per-barber refresh) may race on the same slot, so
+    duplicates are left to the unique key instead of failing the whole chunk.
+    """
+    stmt = _insert_ignore(db)
+    inserted = 0
+    for i in range(0, len(rows), SLOT_INSERT_CHUNK_SIZE):
+        inserted += (await db.execute(stmt.values(rows[i:i + SLOT_INSERT_CHUNK_SIZE]))).rowcount
+    return inserted
+
+
+def _stale_slot_ids(existing, desired, now_dt):
+    """Ids of the unbooked, not yet ended slots in `existing` whose (barber_id, slot_date, slot_time) is not desired."""
+    return [
+        slot.slot_id for slot in existing
+        if not slot.is_booked
+        and (slot.barber_id, slot.slot_date, slot.slot_time) not in desired
+        and datetime.combine(slot.slot_date, slot.slot_time) + SLOT_DURATION > now_dt
+    ]
+
+
+async def _delete_free_slots(db, slot_ids):
+    """Delete slots in chunks, re-checking is_booked so a slot claimed in the meantime is kept."""
+    deleted = 0
+    for i in range(0, len(slot_ids), SLOT_INSERT_CHUNK_SIZE):
+        result = await db.execute(
+            delete(BarberSlot).where(
+                BarberSlot.slot_id.in_(slot_ids[i:i + SLOT_INSERT_CHUNK_SIZE]), BarberSlot.is_booked == False
+            )
+        )
+        deleted += result.rowcount
+    return deleted
+
+
+async def generate_barber_slots(single_barber_id: int = None):
+    """Reconcile every barber's slots over the rolling SLOT_HORIZON_DAYS window with their settings.
 
+    Eligible barbers (generated daily, available, in an open shop), their BarberAvailability
+    overrides and the slots to compare against are each loaded in one query. Missing slots are
+    written with chunked multi-row INSERTs and unbooked future slots outside a barber's desired
+    hours are deleted in chunks - all of them for barbers that are no longer eligible - so a lost
+    or failed per-barber refresh is repaired on the next pass. Booked slots are never touched.
+    Returns the rows created and retired and the elapsed time; errors are rolled back and
+    re-raised so the job runner records the run as failed.
+    """
+    started = time.perf_counter()
+    db = async_session()
+    try:
+        now_dt = datetime.now()
+        slot_dates = _slot_window(now_dt)
+        today, last_date = slot_dates[0], slot_dates[-1]
+
+        eligible_query = (
+            select(Barber.barber_id, Barber.barber_name, Barber.shop_id, Barber.start_time, Barber.end_time)
+            .join(Shop, Shop.shop_id == Barber.shop_id)
+            .filter(
+                Barber.generate_daily == True,
+                Barber.is_available == True,
+                Shop.is_open == True
+            )
+        )
+        if single_barber_id:
+            eligible_query = eligible_query.filter(Barber.barber_id == single_barber_id)
+
+        barbers = []
+        for barber in (await db.execute(eligible_query)).all():
             if not barber.start_time or not barber.end_time:
                 logger.warning(f"[SLOT AGENT] Barber {barber.barber_name} missing start/end time, skipping")
                 continue
+            barbers.append(barber)
 
-            start_dt = datetime.combine(today, barber.start_time)
-            end_dt = datetime.combine(today, barber.end_time)
-            current_slot_start = start_dt
+        overrides = {}
+        if barbers:
+            overrides = await _load_overrides(db, [barber.barber_id for barber in barbers], today, last_date)
+        wanted_rows = _missing_slots(barbers, set(), slot_dates, now_dt, overrides)
+        desired = {(row["barber_id"], row["slot_date"], row["slot_time"]) for row in wanted_rows}
 
-            while current_slot_start + slot_duration <= end_dt:
-                if current_slot_start + slot_duration <= now_dt:
-                    current_slot_start += slot_duration
-                    continue
+        # Every slot of the eligible barbers (to find gaps) and every free slot of any barber (to find stale ones)
+        existing_query = select(
+            BarberSlot.slot_id, BarberSlot.barber_id, BarberSlot.slot_date, BarberSlot.slot_time, BarberSlot.is_booked
+        ).filter(
+            BarberSlot.slot_date.between(today, last_date),
+            or_(
+                BarberSlot.is_booked == False,
+                BarberSlot.barber_id.in_(eligible_query.with_only_columns(Barber.barber_id))
+            )
+        )
+        if single_barber_id:
+            existing_query = existing_query.filter(BarberSlot.barber_id == single_barber_id)
+        existing = (await db.execute(existing_query)).all()
 
-                slot_time = current_slot_start.time()
+        retired = await _delete_free_slots(db, _stale_slot_ids(existing, desired, now_dt))
 
-                exists = db.query(BarberSlot).filter(
-                    BarberSlot.barber_id == barber.barber_id,
-                    BarberSlot.slot_date == today,
-                    BarberSlot.slot_time == slot_time
-                ).first()
+        existing_keys = {(slot.barber_id, slot.slot_date, slot.slot_time) for slot in existing}
+        rows = [row for row in wanted_rows
+                if (row["barber_id"], row["slot_date"], row["slot_time"]) not in existing_keys]
+        created = await _insert_slots(db, rows)
+        await db.commit()
 
-                if not exists:
-                    new_slot = BarberSlot(
-                        barber_id=barber.barber_id,
-                        shop_id=barber.shop_id,
-                        slot_date=today,
-                        slot_time=slot_time,
-                        status="available",
-                        is_booked=False
-                    )
-                    db.add(new_slot)
-                    logger.info(f"[SLOT AGENT] Created slot for {barber.barber_name} at {slot_time}")
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"[SLOT AGENT] Created {created} and retired {retired} slots for {len(barbers)} barbers in {elapsed_ms} ms"
+        )
+        return {"created": created, "retired": retired, "elapsed_ms": elapsed_ms}
 
-                current_slot_start += slot_duration
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"[SLOT AGENT ERROR] {str(e)}")
+        raise
+    finally:
+        await db.close()
 
-        db.commit()
-        logger.info("[SLOT AGENT] Slots generation completed successfully")
+
+async def refresh_barber_slots(barber_id: int):
+    """Bring one barber's slots in line with their current settings after a create or update.
+
+    Missing slots inside the (possibly new) working hours are inserted and unbooked future slots
+    that fall outside them are retired. A barber that is unavailable, no longer generated daily
+    or whose shop is closed has all unbooked future slots retired. Booked slots are never touched.
+    """
+    started = time.perf_counter()
+    db = async_session()
+    try:
+        now_dt = datetime.now()
+        slot_dates = _slot_window(now_dt)
+        today, last_date = slot_dates[0], slot_dates[-1]
+
+        barber = (await db.execute(
+            select(Barber.barber_id, Barber.barber_name, Barber.shop_id, Barber.start_time, Barber.end_time,
+                   Barber.is_available, Barber.generate_daily, Shop.is_open)
+            .join(Shop, Shop.shop_id == Barber.shop_id)
+            .filter(Barber.barber_id == barber_id)
+        )).first()
+        if not barber:
+            logger.info(f"[SLOT AGENT] Barber {barber_id} not found, nothing to refresh")
+            return {"created": 0, "retired": 0, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+        eligible = bool(barber.is_available and barber.generate_daily and barber.is_open
+                        and barber.start_time and barber.end_time)
+        wanted_rows = []
+        if eligible:
+            overrides = await _load_overrides(db, [barber_id], today, last_date)
+            wanted_rows = _missing_slots([barber], set(), slot_dates, now_dt, overrides)
+        desired = {(row["barber_id"], row["slot_date"], row["slot_time"]) for row in wanted_rows}
+
+        existing = (await db.execute(
+            select(BarberSlot.slot_id, BarberSlot.barber_id, BarberSlot.slot_date, BarberSlot.slot_time,
+                   BarberSlot.is_booked)
+            .filter(BarberSlot.barber_id == barber_id, BarberSlot.slot_date.between(today, last_date))
+        )).all()
+
+        retired = await _delete_free_slots(db, _stale_slot_ids(existing, desired, now_dt))
+
+        existing_keys = {(slot.barber_id, slot.slot_date, slot.slot_time) for slot in existing}
+        rows = [row for row in wanted_rows
+                if (row["barber_id"], row["slot_date"], row["slot_time"]) not in existing_keys]
+        created = await _insert_slots(db, rows)
+        await db.commit()
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"[SLOT AGENT] Refreshed barber {barber_id}: created {created}, retired {retired} in {elapsed_ms} ms"
+        )
+        return {"created": created, "retired": retired, "elapsed_ms": elapsed_ms}
 
     except Exception as e:
-        db.rollback()
-        logger.error(f"[SLOT AGENT ERROR] {str(e)}")
+        await db.rollback()
+        logger.error(f"[SLOT AGENT ERROR] Refresh for barber {barber_id} failed: {str(e)}")
+        raise
     finally:
-        db.close()
+        await db.close()
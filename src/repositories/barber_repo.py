@@ -10,31 +10,39 @@ class BarberRepository:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_barber_by_id(db: AsyncSession, barber_id: int):
-        result = await db.execute(select(Barber).filter(Barber.barber_id == barber_id))
-        return result.scalar_one_or_none()
+    async def get_barber_with_owner(db: AsyncSession, barber_id: int):
+        """Return (barber, owner_id of its shop) in one query, or None if the barber does not exist.
+
+        Owner mutations check `owner_id` on the returned row instead of loading the shop separately.
+        """
+        result = await db.execute(
+            select(Barber, Shop.owner_id)
+            .join(Shop, Shop.shop_id == Barber.shop_id)
+            .filter(Barber.barber_id == barber_id)
+        )
+        return result.one_or_none()
 
     @staticmethod
     async def get_available_barbers(db: AsyncSession, shop_id: int):
         result = await db.execute(
-            select(Barber).filter(Barber.shop_id == shop_id, Barber.is_available == True)
+            select(Barber.barber_id, Barber.barber_name, Barber.shop_id, Barber.start_time, Barber.end_time,
+                   Barber.is_available, Barber.generate_daily, Barber.created_at)
+            .filter(Barber.shop_id == shop_id, Barber.is_available == True)
         )
-        return result.scalars().all()
+        return result.all()
 
     @staticmethod
     async def add_barber(db: AsyncSession, barber: Barber):
         db.add(barber)
-        await db.commit()
-        await db.refresh(barber)
+        await db.flush()
         return barber
 
     @staticmethod
     async def delete_barber(db: AsyncSession, barber: Barber):
         await db.delete(barber)
-        await db.commit()
+        await db.flush()
 
     @staticmethod
     async def update_barber(db: AsyncSession, barber: Barber):
-        await db.commit()
-        await db.refresh(barber)
+        await db.flush()
         return barber
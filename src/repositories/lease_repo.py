@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from src.db.models import SchedulerLease
+
+
+class LeaseRepository:
+
+    @staticmethod
+    async def try_acquire(db, name: str, holder: str, ttl_seconds: float, now: datetime = None) -> bool:
+        """Take or renew the lease `name` for `holder`; returns True while `holder` owns it.
+
+        The guarded UPDATE only matches when `holder` already owns the lease or it has expired, so
+        two workers can never both succeed. A missing row is created; losing that INSERT race to
+        another worker surfaces as an IntegrityError and means the lease is taken.
+        """
+        now = now or datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        result = await db.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == name,
+                or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+            )
+            .values(holder=holder, expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            await db.commit()
+            return True
+
+        db.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at, acquired_at=now))
+        try:
+            await db.commit()
+            return True
+        except IntegrityError:
+            await db.rollback()
+            return False
+
+    @staticmethod
+    async def release(db, name: str, holder: str):
+        """Expire the lease immediately if `holder` owns it so another worker can take over."""
+        await db.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
@@ -8,16 +8,19 @@ class MenuRepository:
     @staticmethod
     async def get_menu_by_shop(db, shop_id: int):
         logger.info(f"Fetching menu for shop_id={shop_id}")
-        result = await db.execute(select(Menu).filter(Menu.shop_id == shop_id))
-        menu_items = result.scalars().all()
-        return menu_items
+        # Column rows, not entities: the menu is only ever read out, so skip identity-map hydration
+        result = await db.execute(
+            select(Menu.menu_id, Menu.service_name, Menu.description, Menu.price, Menu.duration_minutes,
+                   Menu.is_active, Menu.created_at)
+            .filter(Menu.shop_id == shop_id)
+        )
+        return result.all()
 
     @staticmethod
     async def create_menu_item(db, menu_obj):
         logger.info(f"Creating menu item: {menu_obj.service_name}")
         db.add(menu_obj)
-        await db.commit()
-        await db.refresh(menu_obj)
+        await db.flush()
         return menu_obj
 
     @staticmethod
@@ -39,13 +42,17 @@ class MenuRepository:
         return result.scalar_one_or_none()
     
     @staticmethod
-    async def get_menu_by_id(db, menu_id: int):
-        result = await db.execute(select(Menu).filter(Menu.menu_id == menu_id))
-        return result.scalar_one_or_none()
+    async def get_menu_with_owner(db, menu_id: int):
+        """Return (menu item, owner_id of its shop) in one query, or None if the item does not exist."""
+        result = await db.execute(
+            select(Menu, Shop.owner_id)
+            .join(Shop, Shop.shop_id == Menu.shop_id)
+            .filter(Menu.menu_id == menu_id)
+        )
+        return result.one_or_none()
 
     #  New: Update menu item
     @staticmethod
     async def update_menu_item(db, menu: Menu):
-        await db.commit()
-        await db.refresh(menu)
+        await db.flush()
         return menu
\ No newline at end of file
@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import or_, and_, delete, update
+from sqlalchemy.future import select
+from src.db.models import EmailOutbox
+from src.core.logger import logger
+
+
+class EmailOutboxRepository:
+
+    @staticmethod
+    async def enqueue(db, recipient: str, subject: str, body: str):
+        logger.info(f"Queueing email to {recipient}")
+        message = EmailOutbox(recipient=recipient, subject=subject, body=body, status="pending", attempts=0,
+                              next_attempt_at=datetime.utcnow())
+        db.add(message)
+        await db.flush()
+        return message
+
+    @staticmethod
+    async def claim_batch(db, limit: int, lease_seconds: int = 300):
+        """Claim up to `limit` due messages for this worker and return them.
+
+        Claiming stamps a fresh token with a guarded UPDATE, so concurrent workers never send the
+        same message twice. Messages stuck in 'sending' longer than the lease are reclaimed.
+        """
+        now = datetime.utcnow()
+        claimable = or_(
+            and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == "sending", EmailOutbox.claimed_at < now - timedelta(seconds=lease_seconds)),
+        )
+        result = await db.execute(
+            select(EmailOutbox.id).filter(claimable).order_by(EmailOutbox.next_attempt_at).limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return []
+
+        token = uuid.uuid4().hex
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids), claimable)
+            .values(status="sending", claim_token=token, claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        result = await db.execute(select(EmailOutbox).filter(EmailOutbox.claim_token == token))
+        return result.scalars().all()
+
+    @staticmethod
+    async def mark_sent(db, message_ids: list[int]):
+        """Mark delivered messages sent and drop their bodies, which carry the OTP codes."""
+        await db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(message_ids))
+            .values(status="sent", sent_at=datetime.utcnow(), claim_token=None, last_error=None, body="")
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def mark_failed(db, message: EmailOutbox, error: str, max_attempts: int, retry_seconds: int):
+        """Schedule a retry with exponential backoff, or give up (and drop the body) after `max_attempts`."""
+        message.attempts = (message.attempts or 0) + 1
+        message.last_error = error[:1000]
+        message.claim_token = None
+        if message.attempts >= max_attempts:
+            message.status = "failed"
+            message.body = ""
+            logger.error(f"Giving up on email {message.id} to {message.recipient} after {message.attempts} attempts")
+        else:
+            message.status = "pending"
+            message.next_attempt_at = datetime.utcnow() + timedelta(seconds=retry_seconds * 2 ** (message.attempts - 1))
+
+    @staticmethod
+    async def purge_finished(db, cutoff: datetime, limit: int) -> int:
+        """Delete up to `limit` sent or failed messages created before `cutoff`; returns rows removed.
+
+        Ids are picked through ix_email_outbox_status_created first so the DELETE only locks the
+        rows in this chunk.
+        """
+        finished = and_(EmailOutbox.status.in_(("sent", "failed")), EmailOutbox.created_at < cutoff)
+        result = await db.execute(
+            select(EmailOutbox.id).filter(finished).order_by(EmailOutbox.created_at).limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return 0
+        result = await db.execute(
+            delete(EmailOutbox)
+            .where(EmailOutbox.id.in_(ids), finished)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,24 +1,45 @@
+from sqlalchemy import and_, exists, insert, or_, update
 from sqlalchemy.future import select
 from fastapi import HTTPException
-from src.db.models import Shop, Barber, BarberSlot, Booking, User
+from src.db.models import Shop, Barber, BarberSlot, Booking, Menu, User
 from src.core.logger import logger
 
 class ShopRepository:
 
     @staticmethod
-    async def get_all_shops(db):
-        logger.info("Fetching all shops from DB")
-        result = await db.execute(select(Shop))
-        shops = result.scalars().all()
-        if not shops:
-            raise HTTPException(status_code=404, detail="No shops found")
-        return shops
+    async def get_shops_page(db, limit: int, after_id: int = None, city: str = None, state: str = None,
+                             is_open: bool = None):
+        """Return up to `limit` shops with shop_id > `after_id` as column rows, in shop_id order.
+
+        Seeking past the last seen id (instead of OFFSET) keeps every page an index range scan,
+        so later pages cost the same as the first.
+        """
+        logger.info(f"Fetching shops page after={after_id} limit={limit} city={city} state={state} is_open={is_open}")
+        query = select(
+            Shop.shop_id, Shop.shop_name, Shop.address, Shop.city, Shop.state,
+            Shop.open_time, Shop.close_time, Shop.is_open
+        )
+        if after_id is not None:
+            query = query.filter(Shop.shop_id > after_id)
+        if city:
+            query = query.filter(Shop.city == city)
+        if state:
+            query = query.filter(Shop.state == state)
+        if is_open is not None:
+            query = query.filter(Shop.is_open == is_open)
+        result = await db.execute(query.order_by(Shop.shop_id).limit(limit))
+        return result.all()
 
     @staticmethod
     async def get_shops_by_owner(db, owner_id: int):
         logger.info(f"Fetching shops for owner_id={owner_id}")
-        result = await db.execute(select(Shop).filter(Shop.owner_id == owner_id))
-        shops = result.scalars().all()
+        result = await db.execute(
+            select(
+                Shop.shop_id, Shop.shop_name, Shop.address, Shop.city, Shop.state,
+                Shop.open_time, Shop.close_time, Shop.is_open
+            ).filter(Shop.owner_id == owner_id)
+        )
+        shops = result.all()
         if not shops:
             raise HTTPException(status_code=404, detail="No shops found for owner")
         return shops
@@ -39,6 +60,69 @@ class ShopRepository:
             raise HTTPException(status_code=404, detail="No available slots found")
         return slots
 
+    @staticmethod
+    async def stream_slots_in_range(db, shop_id: int, start_date, end_date, barber_id: int = None,
+                                    only_available: bool = False):
+        """Stream a shop's slots between two dates ordered by (slot_date, barber_id, slot_time).
+
+        The order follows ix_barber_slots_shop_date, so the whole range is one index range scan
+        and rows arrive already grouped by day and barber.
+        """
+        logger.info(f"Streaming slots for shop_id={shop_id} from {start_date} to {end_date}")
+        query = (
+            select(BarberSlot.slot_date, BarberSlot.barber_id, Barber.barber_name, BarberSlot.slot_id,
+                   BarberSlot.slot_time, BarberSlot.status)
+            .join(Barber, BarberSlot.barber_id == Barber.barber_id)
+            .filter(BarberSlot.shop_id == shop_id, BarberSlot.slot_date.between(start_date, end_date))
+            .order_by(BarberSlot.slot_date, BarberSlot.barber_id, BarberSlot.slot_time)
+        )
+        if barber_id is not None:
+            query = query.filter(BarberSlot.barber_id == barber_id)
+        if only_available:
+            query = query.filter(BarberSlot.is_booked == False)
+        return await db.stream(query)
+
+    @staticmethod
+    async def find_earliest_slots(db, after, until_date, limit: int, city: str = None, state: str = None,
+                                  service: str = None):
+        """Return the `limit` earliest free slots starting at or after `after` across open shops.
+
+        ix_barber_slots_free_time yields free slots in (slot_date, slot_time) order, so the query
+        stops as soon as `limit` slots pass the shop/service filters, whatever the shop count.
+        """
+        logger.info(f"Searching earliest slots after {after} city={city} state={state} service={service}")
+        query = (
+            select(BarberSlot.slot_id, BarberSlot.slot_date, BarberSlot.slot_time, BarberSlot.barber_id,
+                   Barber.barber_name, Shop.shop_id, Shop.shop_name, Shop.city, Shop.state)
+            .join(Shop, Shop.shop_id == BarberSlot.shop_id)
+            .join(Barber, Barber.barber_id == BarberSlot.barber_id)
+            .filter(
+                BarberSlot.is_booked == False,
+                or_(
+                    BarberSlot.slot_date > after.date(),
+                    and_(BarberSlot.slot_date == after.date(), BarberSlot.slot_time >= after.time()),
+                ),
+                BarberSlot.slot_date <= until_date,
+                Shop.is_open == True,
+            )
+            .order_by(BarberSlot.slot_date, BarberSlot.slot_time, BarberSlot.slot_id)
+            .limit(limit)
+        )
+        if city:
+            query = query.filter(Shop.city == city)
+        if state:
+            query = query.filter(Shop.state == state)
+        if service:
+            query = query.filter(
+                exists().where(
+                    Menu.shop_id == BarberSlot.shop_id,
+                    Menu.is_active == True,
+                    Menu.service_name.ilike(f"%{service}%"),
+                )
+            )
+        result = await db.execute(query)
+        return result.all()
+
     @staticmethod
     async def get_user_by_id(db, user_id: int):
         result = await db.execute(select(User).filter(User.id == user_id))
@@ -53,19 +137,30 @@ class ShopRepository:
     async def create_shop(db, shop_obj):
         logger.info(f"Creating shop: {shop_obj.shop_name}")
         db.add(shop_obj)
-        await db.commit()
-        await db.refresh(shop_obj)
+        await db.flush()
         return shop_obj
 
     @staticmethod
-    async def get_slot_by_id(db, slot_id: int, shop_id: int):
-        result = await db.execute(select(BarberSlot).filter(BarberSlot.slot_id == slot_id, BarberSlot.shop_id == shop_id))
-        return result.scalar_one_or_none()
+    async def get_slots_by_ids(db, slot_ids: list[int], shop_id: int):
+        result = await db.execute(
+            select(BarberSlot.slot_id, BarberSlot.barber_id, BarberSlot.slot_date, BarberSlot.slot_time,
+                   BarberSlot.is_booked)
+            .filter(BarberSlot.slot_id.in_(slot_ids), BarberSlot.shop_id == shop_id)
+        )
+        return result.all()
+
+    @staticmethod
+    async def claim_slots(db, slot_ids: list[int], shop_id: int):
+        """Mark the slots booked only if they are still free; returns how many rows were claimed."""
+        result = await db.execute(
+            update(BarberSlot)
+            .where(BarberSlot.slot_id.in_(slot_ids), BarberSlot.shop_id == shop_id, BarberSlot.is_booked == False)
+            .values(is_booked=True, status="booked")
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     @staticmethod
-    async def create_booking(db, booking):
-        logger.info(f"Creating booking for user_id={booking.user_id}")
-        db.add(booking)
-        await db.commit()
-        await db.refresh(booking)
-        return booking
+    async def create_bookings(db, bookings: list[dict]):
+        logger.info(f"Creating {len(bookings)} bookings for user_id={bookings[0]['user_id']}")
+        await db.execute(insert(Booking).values(bookings))
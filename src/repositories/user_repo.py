@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete
 from sqlalchemy.future import select
 from src.db.models import User, EmailVerification  # ensure EmailVerification model exists
 from src.core.logger import logger
@@ -22,15 +23,13 @@ class UserRepository:
     async def create_user(db, user: User):
         logger.info(f"Creating new user: {user.email}")
         db.add(user)
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
         return user
 
     @staticmethod
     async def update_user(db, user: User):
         logger.info(f"Updating user: {user.email}")
-        await db.commit()
-        await db.refresh(user)
+        await db.flush()
         return user
 
     
@@ -46,8 +45,7 @@ class UserRepository:
             record = EmailVerification(email=email, otp_code=otp, otp_expiry=expiry_time)
 
         db.add(record)
-        await db.commit()
-        await db.refresh(record)
+        await db.flush()
         return record
     
     @staticmethod
@@ -56,3 +54,30 @@ class UserRepository:
         logger.info(f"Fetching OTP record for email: {email}")
         result = await db.execute(select(EmailVerification).filter(EmailVerification.email == email))
         return result.scalar_one_or_none()
+
+    @staticmethod
+    async def delete_otp(db, email: str):
+        await db.execute(delete(EmailVerification).where(EmailVerification.email == email))
+
+    @staticmethod
+    async def purge_expired_otps(db, cutoff: datetime, limit: int) -> int:
+        """Delete up to `limit` OTP records that expired before `cutoff`; returns rows removed.
+
+        Ids are picked through ix_email_verification_otp_expiry first so the DELETE only locks
+        the rows in this chunk.
+        """
+        result = await db.execute(
+            select(EmailVerification.id)
+            .filter(EmailVerification.otp_expiry < cutoff)
+            .order_by(EmailVerification.otp_expiry)
+            .limit(limit)
+        )
+        ids = result.scalars().all()
+        if not ids:
+            return 0
+        result = await db.execute(
+            delete(EmailVerification)
+            .where(EmailVerification.id.in_(ids), EmailVerification.otp_expiry < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -27,6 +27,17 @@ class SlotResponse(BaseModel):
     slot_time: str
     status: str
 
+class EarliestSlotResponse(BaseModel):
+    slot_id: int
+    slot_date: str
+    slot_time: str
+    shop_id: int
+    shop_name: str
+    city: str
+    state: str
+    barber_id: int
+    barber_name: str
+
 class BookingRequest(BaseModel):
     user_id: int
     barber_id: int
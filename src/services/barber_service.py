@@ -1,9 +1,24 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.scheduler import enqueue_barber_slot_refresh
 from src.db.models import Barber
 from src.repositories.barber_repo import BarberRepository
 from src.schemas.barber_schemas import BarberCreate, BarberUpdate
 
+
+def _barber_to_dict(b):
+    return {
+        "barber_id": b.barber_id,
+        "barber_name": b.barber_name,
+        "shop_id": b.shop_id,
+        "start_time": b.start_time,
+        "end_time": b.end_time,
+        "is_available": b.is_available,
+        "generate_daily": b.generate_daily,
+        "created_at": b.created_at,
+    }
+
+
 class BarberService:
 
     @staticmethod
@@ -22,18 +37,22 @@ class BarberService:
         )
 
         await BarberRepository.add_barber(db, barber)
+        await db.commit()
+        enqueue_barber_slot_refresh(barber.barber_id)
         return {"msg": "Barber added successfully", "barber_id": barber.barber_id}
 
     @staticmethod
     async def update_barber(db: AsyncSession, barber_id: int, owner_id: int, data: BarberUpdate):
-        barber = await BarberRepository.get_barber_by_id(db, barber_id)
-        if not barber:
+        row = await BarberRepository.get_barber_with_owner(db, barber_id)
+        if not row:
             raise HTTPException(status_code=404, detail="Barber not found")
 
-        shop = await BarberRepository.get_shop_by_id(db, barber.shop_id)
-        if shop.owner_id != owner_id:
+        barber, shop_owner_id = row
+        if shop_owner_id != owner_id:
             raise HTTPException(status_code=403, detail="Not authorized to update this barber")
 
+        schedule_before = (barber.start_time, barber.end_time, barber.is_available, barber.generate_daily)
+
         barber.barber_name = data.barber_name or barber.barber_name
         barber.start_time = data.start_time or barber.start_time
         barber.end_time = data.end_time or barber.end_time
@@ -41,19 +60,23 @@ class BarberService:
         barber.generate_daily = data.everyday if data.everyday is not None else barber.generate_daily
 
         await BarberRepository.update_barber(db, barber)
+        await db.commit()
+        if (barber.start_time, barber.end_time, barber.is_available, barber.generate_daily) != schedule_before:
+            enqueue_barber_slot_refresh(barber.barber_id)
         return {"msg": "Barber updated successfully", "barber_id": barber.barber_id}
 
     @staticmethod
     async def delete_barber(db: AsyncSession, barber_id: int, owner_id: int):
-        barber = await BarberRepository.get_barber_by_id(db, barber_id)
-        if not barber:
+        row = await BarberRepository.get_barber_with_owner(db, barber_id)
+        if not row:
             raise HTTPException(status_code=404, detail="Barber not found")
 
-        shop = await BarberRepository.get_shop_by_id(db, barber.shop_id)
-        if shop.owner_id != owner_id:
+        barber, shop_owner_id = row
+        if shop_owner_id != owner_id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this barber")
 
         await BarberRepository.delete_barber(db, barber)
+        await db.commit()
         return {"msg": "Barber deleted successfully"}
 
     @staticmethod
@@ -61,4 +84,4 @@ class BarberService:
         barbers = await BarberRepository.get_available_barbers(db, shop_id)
         if not barbers:
             raise HTTPException(status_code=404, detail="No available barbers found")
-        return barbers
+        return [_barber_to_dict(b) for b in barbers]
@@ -1,6 +1,13 @@
+import hashlib
+import orjson
 from fastapi import HTTPException
 from src.repositories.menu_repo import MenuRepository
 from src.db.models import Menu
+from src.core.cache import TTLCache
+from src.core.config import MENU_CACHE_TTL_SECONDS, MENU_CACHE_MAX_ENTRIES
+
+# shop_id -> (JSON body, ETag); bodies are serialized once per change instead of once per read
+menu_cache = TTLCache("menus", MENU_CACHE_MAX_ENTRIES, MENU_CACHE_TTL_SECONDS)
 
 class MenuService:
 
@@ -33,7 +40,7 @@ class MenuService:
             existing_menu.description = description or existing_menu.description
             existing_menu.is_active = True
             await db.commit()
-            await db.refresh(existing_menu)
+            menu_cache.invalidate(shop_id)
             return existing_menu
 
         #  Otherwise, create new menu item
@@ -46,6 +53,8 @@ class MenuService:
         )
 
         menu = await MenuRepository.create_menu_item(db, new_menu)
+        await db.commit()
+        menu_cache.invalidate(shop_id)
         return menu
 
     @staticmethod
@@ -62,6 +71,20 @@ class MenuService:
                 "created_at": m.created_at
             } for m in menu_items
         ]
+
+    @staticmethod
+    async def get_shop_menu_json(db, shop_id: int):
+        """Return the shop's menu as (JSON bytes, ETag), serializing only when the cache is cold.
+
+        get_shop_menu already builds the MenuResponse shape from typed columns, so the dicts are
+        encoded directly with orjson instead of being validated through the schema first.
+        """
+        async def load():
+            body = orjson.dumps(await MenuService.get_shop_menu(db, shop_id))
+            return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+        return await menu_cache.get_or_load(shop_id, load)
+
     @staticmethod
     async def update_menu_item(db, owner_id: int, menu_id: int,
                                service_name: str = None,
@@ -70,13 +93,13 @@ class MenuService:
                                duration_minutes: int = None):
 
         # Check if menu exists
-        menu = await MenuRepository.get_menu_by_id(db, menu_id)
-        if not menu:
+        row = await MenuRepository.get_menu_with_owner(db, menu_id)
+        if not row:
             raise HTTPException(status_code=404, detail="Menu item not found")
 
         # Verify ownership
-        shop = await MenuRepository.get_shop_by_owner(db, owner_id, menu.shop_id)
-        if not shop:
+        menu, shop_owner_id = row
+        if shop_owner_id != owner_id:
             raise HTTPException(status_code=403, detail="You are not authorized to update this menu")
 
         # Update only provided fields
@@ -90,5 +113,7 @@ class MenuService:
             menu.duration_minutes = duration_minutes
 
         updated_menu = await MenuRepository.update_menu_item(db, menu)
+        await db.commit()
+        menu_cache.invalidate(updated_menu.shop_id)
         return updated_menu
     
\ No newline at end of file
@@ -1,41 +1,68 @@
+import json
+from datetime import datetime, timedelta
 from fastapi import HTTPException
-from src.db.models import Shop, Booking
+from sqlalchemy.exc import IntegrityError
+from src.db.models import Shop
 from src.repositories.shop_repo import ShopRepository
+from src.core.cache import TTLCache
+from src.core.config import SHOP_CACHE_TTL_SECONDS, SHOP_CACHE_MAX_ENTRIES, SLOT_RANGE_MAX_DAYS, SLOT_HORIZON_DAYS
 from src.core.logger import logger
 
+# Listing pages are keyed by their filters and cursor, so any shop write drops them all;
+# per-owner lists are invalidated individually.
+shop_page_cache = TTLCache("shop_pages", SHOP_CACHE_MAX_ENTRIES, SHOP_CACHE_TTL_SECONDS)
+owner_shops_cache = TTLCache("owner_shops", SHOP_CACHE_MAX_ENTRIES, SHOP_CACHE_TTL_SECONDS)
+
+
+def _shop_to_dict(s):
+    return {
+        "shop_id": s.shop_id,
+        "shop_name": s.shop_name,
+        "address": s.address,
+        "city": s.city,
+        "state": s.state,
+        "open_time": str(s.open_time),
+        "close_time": str(s.close_time),
+        "is_open": s.is_open,
+    }
+
+
+def _is_slot_conflict(error: IntegrityError) -> bool:
+    """True when the violation is the one-booking-per-slot key, not a foreign key or other constraint."""
+    message = str(error.orig)
+    # MySQL names the key; SQLite names the column
+    return "uq_booking_slot" in message or "bookings.slot_id" in message
+
+
+def invalidate_shop_listings(owner_id: int):
+    """Drop cached listings a change to one of `owner_id`'s shops can affect; call after any shop write."""
+    shop_page_cache.clear()
+    owner_shops_cache.invalidate(owner_id)
+
+
 class ShopService:
 
     @staticmethod
-    async def get_shops_for_user(db):
-        shops = await ShopRepository.get_all_shops(db)
-        return [
-            {
-                "shop_id": s.shop_id,
-                "shop_name": s.shop_name,
-                "address": s.address,
-                "city": s.city,
-                "state": s.state,
-                "open_time": str(s.open_time),
-                "close_time": str(s.close_time),
-                "is_open": s.is_open,
-            } for s in shops
-        ]
+    async def get_shops_for_user(db, limit: int, cursor: int = None, city: str = None, state: str = None,
+                                 is_open: bool = None):
+        """Return one page of shops and the cursor for the next page (None on the last page)."""
+        async def load():
+            rows = await ShopRepository.get_shops_page(db, limit + 1, cursor, city, state, is_open)
+            if not rows and cursor is None:
+                raise HTTPException(status_code=404, detail="No shops found")
+            page = [_shop_to_dict(r) for r in rows[:limit]]
+            next_cursor = page[-1]["shop_id"] if len(rows) > limit else None
+            return page, next_cursor
+
+        return await shop_page_cache.get_or_load((limit, cursor, city, state, is_open), load)
 
     @staticmethod
     async def get_shops_by_owner(db, owner_id: int):
-        shops = await ShopRepository.get_shops_by_owner(db, owner_id)
-        return [
-            {
-                "shop_id": s.shop_id,
-                "shop_name": s.shop_name,
-                "address": s.address,
-                "city": s.city,
-                "state": s.state,
-                "open_time": str(s.open_time),
-                "close_time": str(s.close_time),
-                "is_open": s.is_open,
-            } for s in shops
-        ]
+        async def load():
+            shops = await ShopRepository.get_shops_by_owner(db, owner_id)
+            return [_shop_to_dict(s) for s in shops]
+
+        return await owner_shops_cache.get_or_load(owner_id, load)
 
     @staticmethod
     async def get_available_slots(db, shop_id: int, date: str):
@@ -51,6 +78,87 @@ class ShopService:
             for r in slots
         ]
 
+    @staticmethod
+    async def get_available_slots_compact(db, shop_id: int, date: str):
+        """Same slots as get_available_slots, grouped per barber with barber details sent once.
+
+        Each barber has parallel `slot_ids` / `start_minutes` (minutes since midnight) arrays and
+        a `booked` bitmask where bit i is set when the i-th slot is not available.
+        """
+        slots = await ShopRepository.get_available_slots(db, shop_id, date)
+        barbers = []
+        group = None
+        for r in slots:
+            if group is None or group["barber_id"] != r.barber_id:
+                group = {"barber_id": r.barber_id, "barber_name": r.barber_name, "slot_ids": [],
+                         "start_minutes": [], "booked": 0}
+                barbers.append(group)
+            if r.status != "available":
+                group["booked"] |= 1 << len(group["slot_ids"])
+            group["slot_ids"].append(r.slot_id)
+            group["start_minutes"].append(r.slot_time.hour * 60 + r.slot_time.minute)
+        return {"shop_id": shop_id, "date": str(date), "barbers": barbers}
+
+    @staticmethod
+    async def find_earliest_slots(db, limit: int, after: datetime = None, city: str = None, state: str = None,
+                                  service: str = None):
+        """Earliest free slots across shops, searched up to SLOT_HORIZON_DAYS ahead of `after` (default now)."""
+        after = after or datetime.now()
+        until_date = after.date() + timedelta(days=SLOT_HORIZON_DAYS)
+        rows = await ShopRepository.find_earliest_slots(db, after, until_date, limit, city, state, service)
+        return [
+            {
+                "slot_id": r.slot_id,
+                "slot_date": str(r.slot_date),
+                "slot_time": str(r.slot_time),
+                "shop_id": r.shop_id,
+                "shop_name": r.shop_name,
+                "city": r.city,
+                "state": r.state,
+                "barber_id": r.barber_id,
+                "barber_name": r.barber_name,
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def validate_slot_range(start_date, end_date):
+        if end_date < start_date:
+            raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+        if (end_date - start_date).days + 1 > SLOT_RANGE_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range is limited to {SLOT_RANGE_MAX_DAYS} days")
+
+    @staticmethod
+    async def stream_slot_range(db, shop_id: int, start_date, end_date, barber_id: int = None,
+                                only_available: bool = False):
+        """Yield a JSON document of slots grouped by date, then barber, one barber-day at a time.
+
+        Shape: {"shop_id", "from", "to", "days": [{"date", "barbers": [{"barber_id", "barber_name",
+        "slots": [{"slot_id", "slot_time", "status"}]}]}]}. Dates with no slots are omitted.
+        """
+        result = await ShopRepository.stream_slots_in_range(db, shop_id, start_date, end_date, barber_id,
+                                                            only_available)
+        yield f'{{"shop_id": {shop_id}, "from": "{start_date}", "to": "{end_date}", "days": ['
+
+        current_date = current_barber = None
+        group = None
+        async for row in result:
+            if row.slot_date != current_date or row.barber_id != current_barber:
+                if group is not None:
+                    yield json.dumps(group)
+                if row.slot_date != current_date:
+                    opening = "]}, " if current_date is not None else ""
+                    yield f'{opening}{{"date": "{row.slot_date}", "barbers": ['
+                else:
+                    yield ", "
+                current_date, current_barber = row.slot_date, row.barber_id
+                group = {"barber_id": row.barber_id, "barber_name": row.barber_name, "slots": []}
+            group["slots"].append({"slot_id": row.slot_id, "slot_time": str(row.slot_time), "status": row.status})
+
+        if group is not None:
+            yield json.dumps(group) + "]}"
+        yield "]}"
+
     @staticmethod
     async def create_shop_if_not_exists(db, owner_id, shop_data):
         user = await ShopRepository.get_user_by_id(db, owner_id)
@@ -75,38 +183,77 @@ class ShopService:
         )
 
         new_shop = await ShopRepository.create_shop(db, shop)
+        await db.commit()
+        invalidate_shop_listings(owner_id)
         return {"message": "Shop created successfully", "shop_id": new_shop.shop_id}
 
     @staticmethod
     async def book_slots(db, user_id: int, barber_id: int, shop_id: int, slot_ids: list[int]):
-        booked_slots = []
+        """Book all requested slots in one transaction, or none of them.
+
+        Slots are read in one query and claimed with a single guarded UPDATE; if another request
+        took any of them in the meantime the whole batch is rolled back. The unique key on
+        bookings.slot_id backs this up, so a slot can never end up with two bookings; only that
+        key maps to 409, bad input is rejected before anything is claimed.
+        Slot ids are claimed in ascending order to keep row-lock order consistent across racers.
+        """
+        slot_ids = sorted(set(slot_ids))
+        if not slot_ids:
+            raise HTTPException(status_code=400, detail="No slots requested")
+
+        if not await ShopRepository.get_user_by_id(db, user_id):
+            raise HTTPException(status_code=404, detail="User not found")
+
+        slots = {s.slot_id: s for s in await ShopRepository.get_slots_by_ids(db, slot_ids, shop_id)}
         for slot_id in slot_ids:
-            slot = await ShopRepository.get_slot_by_id(db, slot_id, shop_id)
+            slot = slots.get(slot_id)
             if not slot:
                 raise HTTPException(status_code=404, detail=f"Slot {slot_id} not found")
+            if slot.barber_id != barber_id:
+                raise HTTPException(status_code=400, detail=f"Slot {slot_id} does not belong to barber {barber_id}")
             if slot.is_booked:
                 raise HTTPException(status_code=400, detail=f"Slot {slot_id} already booked")
 
-            slot.is_booked = True
-            slot.status = "booked"
-
-            booking = Booking(
-                user_id=user_id,
-                barber_id=barber_id,
-                shop_id=shop_id,
-                slot_id=slot.slot_id,
-                booking_date=slot.slot_date,
-                booking_time=slot.slot_time,
-                status="booked",
-            )
-            await ShopRepository.create_booking(db, booking)
-
-            booked_slots.append({
-                "slot_id": slot.slot_id,
-                "slot_date": str(slot.slot_date),
-                "slot_time": str(slot.slot_time),
-                "status": booking.status
-            })
+        try:
+            claimed = await ShopRepository.claim_slots(db, slot_ids, shop_id)
+            if claimed != len(slot_ids):
+                await db.rollback()
+                logger.warning(f"Booking conflict for user_id={user_id}: {claimed}/{len(slot_ids)} slots claimed")
+                raise HTTPException(status_code=409, detail="One or more slots were just booked by someone else")
+
+            await ShopRepository.create_bookings(db, [
+                {
+                    "user_id": user_id,
+                    "barber_id": barber_id,
+                    "shop_id": shop_id,
+                    "slot_id": slot_id,
+                    "booking_date": slots[slot_id].slot_date,
+                    "booking_time": slots[slot_id].slot_time,
+                    "status": "booked",
+                } for slot_id in slot_ids
+            ])
+            await db.commit()
+        except HTTPException:
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            if not _is_slot_conflict(e):
+                logger.error(f"Booking for user_id={user_id} violated a constraint: {str(e.orig)}")
+                raise
+            logger.warning(f"Booking conflict for user_id={user_id}: slot already has a booking")
+            raise HTTPException(status_code=409, detail="One or more slots were just booked by someone else")
+        except Exception:
+            await db.rollback()
+            raise
+
+        booked_slots = [
+            {
+                "slot_id": slot_id,
+                "slot_date": str(slots[slot_id].slot_date),
+                "slot_time": str(slots[slot_id].slot_time),
+                "status": "booked"
+            } for slot_id in slot_ids
+        ]
 
         return {
             "message": f"{len(booked_slots)} slots booked successfully",
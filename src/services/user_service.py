@@ -1,11 +1,14 @@
 import random
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 import pytz
 from fastapi import HTTPException, status
 from src.db.models import User
 from src.repositories.user_repo import UserRepository
-from src.core.security import hash_password, verify_password
-from src.utils.email import send_email_otp
+from src.core.security import hash_password_async, verify_password_async
+from src.core.otp_store import otp_store
+from src.core.config import OTP_TTL_SECONDS
+from src.utils.email import queue_email_otp
+from src.core.scheduler import wake_email_outbox
 from src.core.logger import logger
 
 
@@ -21,7 +24,7 @@ class UserService:
         if phone_number and await UserRepository.get_user_by_phone(db, phone_number):
             raise HTTPException(status_code=400, detail="Phone number already registered")
 
-        hashed_pw = hash_password(password)
+        hashed_pw = await hash_password_async(password)
 
         # Use Kolkata timezone
         kolkata_tz = pytz.timezone("Asia/Kolkata")
@@ -37,6 +40,7 @@ class UserService:
         )
 
         await UserRepository.create_user(db, new_user)
+        await db.commit()
         logger.info(f"New user registered successfully: {email}")
         return {"message": "User registered successfully"}
 
@@ -48,14 +52,12 @@ class UserService:
 
         otp = str(random.randint(100000, 999999))
 
-        # Kolkata timezone
-        kolkata_tz = pytz.timezone("Asia/Kolkata")
-        expiry_time = datetime.now(kolkata_tz) + timedelta(minutes=10)
-
-        await UserRepository.store_otp(db, email, otp, expiry_time)
-        await send_email_otp(email, otp)
+        await otp_store.set(email, otp, OTP_TTL_SECONDS, db=db)
+        await queue_email_otp(db, email, otp)
+        await db.commit()
+        wake_email_outbox()
 
-        logger.info(f"OTP sent successfully to {email}")
+        logger.info(f"OTP queued for delivery to {email}")
         return {"message": "Verification OTP sent to your email"}
 
     @staticmethod
@@ -65,7 +67,7 @@ class UserService:
             logger.warning(f"Invalid credentials attempt for {email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             logger.warning(f"Incorrect password attempt for {email}")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
 
@@ -83,27 +85,17 @@ class UserService:
             logger.warning(f"No user found for email: {email}")
             raise HTTPException(status_code=404, detail="User not found")
 
-        otp_record = await UserRepository.get_otp_by_email(db, email)
-        if not otp_record:
-            logger.warning(f"No OTP found for {email}")
-            raise HTTPException(status_code=404, detail="OTP not found")
+        stored_otp = await otp_store.get(email, db=db)
+        if not stored_otp:
+            logger.warning(f"No valid OTP found for {email}")
+            raise HTTPException(status_code=404, detail="OTP not found or expired")
 
-        if otp_record.otp_code != otp:
+        if stored_otp != otp:
             logger.warning(f"Invalid OTP entered for {email}")
             raise HTTPException(status_code=400, detail="Invalid OTP")
 
-        kolkata_tz = pytz.timezone("Asia/Kolkata")
-        current_time = datetime.now(kolkata_tz)
-
-        expiry_time = otp_record.otp_expiry
-        if expiry_time.tzinfo is None:
-            expiry_time = expiry_time.replace(tzinfo=kolkata_tz)
-
-        if expiry_time < current_time:
-            logger.warning(f"Expired OTP for {email}")
-            raise HTTPException(status_code=400, detail="OTP expired")
-
         user.is_verified = True
+        await otp_store.delete(email, db=db)
         await db.commit()
 
         logger.info(f"User logged in successfully via OTP: {email}")
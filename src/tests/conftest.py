@@ -0,0 +1,31 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.cache import clear_all_caches
+from src.db.database import Base
+from src.db.query_stats import instrument_engine
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Service-level caches are module globals; start every test cold."""
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Sessions on a fresh SQLite file with every table created, configured like `async_session`.
+
+    The engine carries the query counters, so tests can assert round trips with track_queries.
+    Modules that need seed data override this fixture and request it by the same name.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    instrument_engine(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    await engine.dispose()
@@ -1,6 +1,11 @@
 import pytest
+from datetime import datetime, time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
-from fastapi import HTTPException
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from src.api.routers import barber_routes
+from src.db.database import get_db
 from src.services.barber_service import BarberService
 
 
@@ -52,11 +57,9 @@ async def test_add_barber_shop_not_found(mock_repo):
 async def test_update_barber_success(mock_repo):
     mock_db = AsyncMock()
     barber_mock = AsyncMock(barber_id=1, shop_id=1)
-    shop_mock = AsyncMock(owner_id=10)
     data = AsyncMock(barber_name="Updated Name", start_time=None, end_time=None, is_available=None, everyday=None)
 
-    mock_repo.get_barber_by_id.return_value = barber_mock
-    mock_repo.get_shop_by_id.return_value = shop_mock
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 10)
     mock_repo.update_barber.return_value = barber_mock
 
     result = await BarberService.update_barber(mock_db, 1, owner_id=10, data=data)
@@ -65,11 +68,43 @@ async def test_update_barber_success(mock_repo):
     assert "barber_id" in result
 
 
+@pytest.mark.asyncio
+@patch("src.services.barber_service.enqueue_barber_slot_refresh")
+@patch("src.services.barber_service.BarberRepository", autospec=True)
+async def test_update_barber_hours_change_queues_slot_refresh(mock_repo, mock_enqueue):
+    mock_db = AsyncMock()
+    barber_mock = AsyncMock(barber_id=1, shop_id=1, start_time="09:00", end_time="18:00",
+                            is_available=True, generate_daily=True)
+    data = AsyncMock(barber_name=None, start_time="10:00", end_time=None, is_available=None, everyday=None)
+
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 10)
+
+    await BarberService.update_barber(mock_db, 1, owner_id=10, data=data)
+
+    mock_enqueue.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+@patch("src.services.barber_service.enqueue_barber_slot_refresh")
+@patch("src.services.barber_service.BarberRepository", autospec=True)
+async def test_update_barber_name_only_skips_slot_refresh(mock_repo, mock_enqueue):
+    mock_db = AsyncMock()
+    barber_mock = AsyncMock(barber_id=1, shop_id=1, start_time="09:00", end_time="18:00",
+                            is_available=True, generate_daily=True)
+    data = AsyncMock(barber_name="Renamed", start_time=None, end_time=None, is_available=None, everyday=None)
+
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 10)
+
+    await BarberService.update_barber(mock_db, 1, owner_id=10, data=data)
+
+    mock_enqueue.assert_not_called()
+
+
 @pytest.mark.asyncio
 @patch("src.services.barber_service.BarberRepository", autospec=True)
 async def test_update_barber_not_found(mock_repo):
     mock_db = AsyncMock()
-    mock_repo.get_barber_by_id.return_value = None
+    mock_repo.get_barber_with_owner.return_value = None
     data = AsyncMock()
 
     with pytest.raises(HTTPException) as exc:
@@ -84,11 +119,9 @@ async def test_update_barber_not_found(mock_repo):
 async def test_update_barber_unauthorized(mock_repo):
     mock_db = AsyncMock()
     barber_mock = AsyncMock(shop_id=1)
-    shop_mock = AsyncMock(owner_id=5)  # different owner
     data = AsyncMock()
 
-    mock_repo.get_barber_by_id.return_value = barber_mock
-    mock_repo.get_shop_by_id.return_value = shop_mock
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 5)  # different owner
 
     with pytest.raises(HTTPException) as exc:
         await BarberService.update_barber(mock_db, 1, owner_id=10, data=data)
@@ -102,10 +135,8 @@ async def test_update_barber_unauthorized(mock_repo):
 async def test_delete_barber_success(mock_repo):
     mock_db = AsyncMock()
     barber_mock = AsyncMock(barber_id=1, shop_id=1)
-    shop_mock = AsyncMock(owner_id=10)
 
-    mock_repo.get_barber_by_id.return_value = barber_mock
-    mock_repo.get_shop_by_id.return_value = shop_mock
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 10)
 
     result = await BarberService.delete_barber(mock_db, 1, owner_id=10)
 
@@ -116,7 +147,7 @@ async def test_delete_barber_success(mock_repo):
 @patch("src.services.barber_service.BarberRepository", autospec=True)
 async def test_delete_barber_not_found(mock_repo):
     mock_db = AsyncMock()
-    mock_repo.get_barber_by_id.return_value = None
+    mock_repo.get_barber_with_owner.return_value = None
 
     with pytest.raises(HTTPException) as exc:
         await BarberService.delete_barber(mock_db, 1, owner_id=10)
@@ -130,10 +161,8 @@ async def test_delete_barber_not_found(mock_repo):
 async def test_delete_barber_unauthorized(mock_repo):
     mock_db = AsyncMock()
     barber_mock = AsyncMock(barber_id=1, shop_id=1)
-    shop_mock = AsyncMock(owner_id=5)  # different owner
 
-    mock_repo.get_barber_by_id.return_value = barber_mock
-    mock_repo.get_shop_by_id.return_value = shop_mock
+    mock_repo.get_barber_with_owner.return_value = (barber_mock, 5)  # different owner
 
     with pytest.raises(HTTPException) as exc:
         await BarberService.delete_barber(mock_db, 1, owner_id=10)
@@ -165,3 +194,22 @@ async def test_get_available_barbers_not_found(mock_repo):
 
     assert exc.value.status_code == 404
     assert "No available barbers found" in exc.value.detail
+
+
+@patch("src.services.barber_service.BarberRepository", autospec=True)
+def test_available_barbers_route_encodes_column_rows(mock_repo):
+    app = FastAPI()
+    app.include_router(barber_routes.router)
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    mock_repo.get_available_barbers.return_value = [
+        SimpleNamespace(barber_id=1, barber_name="Ravi", shop_id=1, start_time=time(9), end_time=time(18, 30),
+                        is_available=True, generate_daily=False, created_at=datetime(2025, 11, 4, 9, 0))
+    ]
+
+    response = TestClient(app).get("/barbers/available/1")
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "barber_id": 1, "barber_name": "Ravi", "shop_id": 1, "start_time": "09:00:00", "end_time": "18:30:00",
+        "is_available": True, "generate_daily": False, "created_at": "2025-11-04T09:00:00",
+    }]
@@ -0,0 +1,54 @@
+import pytest
+
+from src.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache("test_ttl", maxsize=10, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    clock.now = 31
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache("test_lru", maxsize=2, ttl_seconds=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_loader_errors():
+    cache = TTLCache("test_loader", maxsize=10, ttl_seconds=30)
+    calls = []
+
+    async def failing():
+        calls.append("fail")
+        raise LookupError("missing")
+
+    async def loading():
+        calls.append("load")
+        return [1, 2]
+
+    with pytest.raises(LookupError):
+        await cache.get_or_load("k", failing)
+    assert await cache.get_or_load("k", loading) == [1, 2]
+    assert await cache.get_or_load("k", loading) == [1, 2]
+    assert calls == ["fail", "load"]
@@ -0,0 +1,163 @@
+import socket
+import socketserver
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from src.db.models import EmailOutbox
+from src.jobs.email_outbox import drain_email_outbox, purge_email_outbox
+from src.repositories.outbox_repo import EmailOutboxRepository
+from src.utils.smtp import SMTPMailer
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail; rejects recipients on the server's blocklist."""
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.wfile.write(b"220 localhost stand-in\r\n")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250 localhost\r\n")
+            elif command.startswith("RCPT TO") and any(b.upper() in command for b in server.blocked):
+                self.wfile.write(b"550 mailbox unavailable\r\n")
+            elif command.startswith("DATA"):
+                self.wfile.write(b"354 end with .\r\n")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                server.delivered += 1
+                self.wfile.write(b"250 queued\r\n")
+            elif command.startswith("QUIT"):
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections = server.delivered = 0
+    server.blocked = ["bounce@example.com"]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_drain_reuses_one_connection_and_retries_failures(smtp_server, session_factory):
+    async with session_factory() as db:
+        for i in range(5):
+            await EmailOutboxRepository.enqueue(db, f"user{i}@example.com", "Your OTP", f"OTP {i}")
+        await EmailOutboxRepository.enqueue(db, "bounce@example.com", "Your OTP", "OTP x")
+        await db.commit()
+
+    mailer = SMTPMailer(host="127.0.0.1", port=smtp_server.server_address[1], use_tls=False,
+                        username=None, password=None)
+    with patch("src.jobs.email_outbox.async_session", session_factory):
+        first = await drain_email_outbox(mailer, batch_size=2)
+        second = await drain_email_outbox(mailer, batch_size=2)
+    mailer.close()
+
+    async with session_factory() as db:
+        rows = {m.recipient: m for m in (await db.execute(select(EmailOutbox))).scalars().all()}
+
+    assert first == {"sent": 5, "failed": 1}
+    assert second == {"sent": 0, "failed": 0}  # failed message is backing off, not due yet
+    assert smtp_server.delivered == 5
+    assert smtp_server.connections == 1
+    assert mailer.connections_opened == 1
+    assert rows["user0@example.com"].status == "sent"
+    assert rows["bounce@example.com"].status == "pending"
+    assert rows["bounce@example.com"].attempts == 1
+    assert rows["user0@example.com"].body == ""
+    assert rows["bounce@example.com"].body == "OTP x"  # kept for the retry
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_never_hands_out_a_message_twice(session_factory):
+    async with session_factory() as db:
+        await EmailOutboxRepository.enqueue(db, "user@example.com", "Your OTP", "OTP 1")
+        await db.commit()
+
+    async with session_factory() as first_worker, session_factory() as second_worker:
+        claimed = await EmailOutboxRepository.claim_batch(first_worker, 10)
+        claimed_again = await EmailOutboxRepository.claim_batch(second_worker, 10)
+
+    assert len(claimed) == 1
+    assert claimed_again == []
+
+
+@pytest.mark.asyncio
+async def test_unreachable_smtp_server_fails_the_claimed_batch_with_backoff(session_factory):
+    async with session_factory() as db:
+        await EmailOutboxRepository.enqueue(db, "user@example.com", "Your OTP", "OTP 1")
+        await db.commit()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        closed_port = probe.getsockname()[1]
+    mailer = SMTPMailer(host="127.0.0.1", port=closed_port, use_tls=False, username=None, password=None,
+                        timeout=2)
+    with patch("src.jobs.email_outbox.async_session", session_factory):
+        result = await drain_email_outbox(mailer, batch_size=2)
+
+    async with session_factory() as db:
+        message = (await db.execute(select(EmailOutbox))).scalar_one()
+
+    assert result == {"sent": 0, "failed": 1}
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert message.last_error
+    assert message.claim_token is None
+
+
+@pytest.mark.asyncio
+async def test_body_is_dropped_when_a_message_finally_fails(session_factory):
+    async with session_factory() as db:
+        message = await EmailOutboxRepository.enqueue(db, "user@example.com", "Your OTP", "OTP 1")
+        await EmailOutboxRepository.mark_failed(db, message, "550 mailbox unavailable", max_attempts=2,
+                                                retry_seconds=30)
+        assert (message.status, message.body) == ("pending", "OTP 1")
+        await EmailOutboxRepository.mark_failed(db, message, "550 mailbox unavailable", max_attempts=2,
+                                                retry_seconds=30)
+        await db.commit()
+
+    assert (message.status, message.body) == ("failed", "")
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_old_finished_messages_in_chunks(session_factory):
+    old, recent = datetime.utcnow() - timedelta(days=30), datetime.utcnow()
+    async with session_factory() as db:
+        db.add_all(
+            [EmailOutbox(recipient=f"sent{i}@example.com", subject="s", body="", status="sent", created_at=old)
+             for i in range(3)]
+            + [
+                EmailOutbox(recipient="failed@example.com", subject="s", body="", status="failed", created_at=old),
+                EmailOutbox(recipient="pending@example.com", subject="s", body="b", status="pending", created_at=old),
+                EmailOutbox(recipient="recent@example.com", subject="s", body="", status="sent", created_at=recent),
+            ]
+        )
+        await db.commit()
+
+    with patch("src.jobs.email_outbox.async_session", session_factory):
+        first = await purge_email_outbox(chunk_size=2, max_chunks=1)
+        second = await purge_email_outbox(chunk_size=2, max_chunks=5)
+
+    async with session_factory() as db:
+        left = sorted((await db.execute(select(EmailOutbox.recipient))).scalars().all())
+
+    assert (first["deleted"], first["chunks"]) == (2, 1)
+    assert (second["deleted"], second["chunks"]) == (2, 2)
+    assert left == ["pending@example.com", "recent@example.com"]
@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.leader import LeaderElector
+from src.core.scheduler import AsyncJobRunner
+from src.repositories.lease_repo import LeaseRepository
+
+
+@pytest.mark.asyncio
+async def test_only_one_holder_owns_the_lease_until_it_expires(session_factory):
+    now = datetime(2025, 11, 4, 9, 0)
+    async with session_factory() as db:
+        assert await LeaseRepository.try_acquire(db, "scheduler", "worker-a", 30, now=now)
+        assert not await LeaseRepository.try_acquire(db, "scheduler", "worker-b", 30, now=now)
+        assert await LeaseRepository.try_acquire(db, "scheduler", "worker-a", 30, now=now + timedelta(seconds=10))
+        assert not await LeaseRepository.try_acquire(db, "scheduler", "worker-b", 30,
+                                                     now=now + timedelta(seconds=35))
+        assert await LeaseRepository.try_acquire(db, "scheduler", "worker-b", 30, now=now + timedelta(seconds=41))
+        assert not await LeaseRepository.try_acquire(db, "scheduler", "worker-a", 30,
+                                                     now=now + timedelta(seconds=42))
+
+
+@pytest.mark.asyncio
+async def test_elections_across_workers_pick_one_leader_and_fail_over(session_factory):
+    electors = [LeaderElector(ttl_seconds=30, session_factory=session_factory, holder=f"worker-{i}")
+                for i in range(4)]
+
+    results = await asyncio.gather(*(elector.step() for elector in electors))
+    assert sum(results) == 1
+
+    leader = next(elector for elector in electors if elector.is_leader)
+    await leader.stop()
+    followers = [elector for elector in electors if elector is not leader]
+    results = await asyncio.gather(*(elector.step() for elector in followers))
+
+    assert sum(results) == 1
+    assert not leader.is_leader
+
+
+@pytest.mark.asyncio
+async def test_leader_only_jobs_are_skipped_on_followers():
+    elector = LeaderElector(holder="worker-b")
+    elector.start = lambda: None
+    follower = AsyncJobRunner(leader=elector)
+    calls = []
+
+    async def job():
+        calls.append("maintenance")
+
+    async def outbox():
+        calls.append("outbox")
+
+    follower.add_job("maintenance", job, interval=0.01, leader_only=True)
+    follower.add_job("outbox", outbox, interval=3600)
+    follower.start()
+    follower.trigger("outbox")
+    await asyncio.sleep(0.05)
+    await follower.shutdown()
+
+    assert calls == ["outbox"]
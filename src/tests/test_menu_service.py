@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routers import menu_routes
+from src.db.database import get_db
+from src.services.menu_service import MenuService
+
+
+def _menu_item(menu_id, price=250.0, shop_id=1):
+    return SimpleNamespace(menu_id=menu_id, shop_id=shop_id, service_name="Haircut", description="Classic cut",
+                           price=price, duration_minutes=30, is_active=True,
+                           created_at=datetime(2025, 11, 4, 9, 0))
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(menu_routes.router)
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    return TestClient(app)
+
+
+@patch("src.services.menu_service.MenuRepository", autospec=True)
+def test_menu_is_served_from_cache_with_etag_and_304(mock_repo, client):
+    mock_repo.get_menu_by_shop.return_value = [_menu_item(1), _menu_item(2)]
+
+    first = client.get("/menu/shop/1")
+    second = client.get("/menu/shop/1")
+    unchanged = client.get("/menu/shop/1", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert [item["menu_id"] for item in json.loads(first.content)] == [1, 2]
+    assert first.json()[0]["created_at"] == "2025-11-04T09:00:00"
+    assert second.content == first.content
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert mock_repo.get_menu_by_shop.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("src.services.menu_service.MenuRepository", autospec=True)
+async def test_update_invalidates_only_that_shops_menu(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_menu_by_shop.side_effect = lambda db, shop_id: [_menu_item(shop_id, shop_id=shop_id)]
+    _, etag_one = await MenuService.get_shop_menu_json(mock_db, 1)
+    await MenuService.get_shop_menu_json(mock_db, 2)
+
+    item = _menu_item(1)
+    mock_repo.get_menu_with_owner.return_value = (item, 5)
+    mock_repo.update_menu_item.return_value = item
+    await MenuService.update_menu_item(mock_db, owner_id=5, menu_id=1, price=300.0)
+
+    mock_repo.get_menu_by_shop.side_effect = lambda db, shop_id: [_menu_item(shop_id, price=300.0)]
+    _, new_etag_one = await MenuService.get_shop_menu_json(mock_db, 1)
+    await MenuService.get_shop_menu_json(mock_db, 2)
+
+    assert new_etag_one != etag_one
+    assert mock_repo.get_menu_by_shop.await_count == 3
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sqlite3
+
+from alembic import command
+from alembic.config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _alembic(db_path):
+    # No ini file: env.py would otherwise run fileConfig and disable the app's loggers for later tests
+    config = Config()
+    config.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    config.cmd_opts = argparse.Namespace(x=[f"db_url=sqlite+aiosqlite:///{db_path}"])
+    return config
+
+
+def test_0002_collapses_duplicate_slots_onto_the_booked_copy_and_dedupes_bookings(tmp_path):
+    db_path = tmp_path / "migrate.db"
+    config = _alembic(db_path)
+    command.upgrade(config, "0001")
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO users (id, username) VALUES (1, 'a'), (2, 'b')")
+        conn.execute("INSERT INTO shops (shop_id, owner_id, shop_name, address, city, state, open_time, close_time)"
+                     " VALUES (1, 1, 'S', 'A', 'C', 'ST', '09:00:00', '18:00:00')")
+        conn.execute("INSERT INTO barbers (barber_id, barber_name, shop_id, start_time, end_time)"
+                     " VALUES (1, 'B', 1, '09:00:00', '18:00:00')")
+        conn.executemany(
+            "INSERT INTO barber_slots (slot_id, barber_id, shop_id, slot_date, slot_time, is_booked, status)"
+            " VALUES (?, 1, 1, '2025-11-04', ?, ?, ?)",
+            [
+                # 10:00 - the lowest id is free, a later copy is booked
+                (1, "10:00:00", 0, "available"), (2, "10:00:00", 1, "booked"), (3, "10:00:00", 0, "available"),
+                # 11:00 - two booked copies, each with a booking
+                (4, "11:00:00", 1, "booked"), (5, "11:00:00", 1, "booked"),
+                # 12:00 - free duplicates
+                (6, "12:00:00", 0, "available"), (7, "12:00:00", 0, "available"),
+                # 13:00 - one slot booked twice by the old read-then-write path
+                (8, "13:00:00", 1, "booked"),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO bookings (booking_id, user_id, barber_id, shop_id, slot_id, booking_date, booking_time)"
+            " VALUES (?, ?, 1, 1, ?, '2025-11-04', '10:00:00')",
+            [(1, 1, 2), (2, 1, 4), (3, 2, 5), (4, 1, 8), (5, 2, 8)],
+        )
+
+    command.upgrade(config, "0002")
+
+    with sqlite3.connect(db_path) as conn:
+        slots = conn.execute("SELECT slot_id, slot_time, is_booked FROM barber_slots ORDER BY slot_time").fetchall()
+        bookings = conn.execute("SELECT booking_id, slot_id FROM bookings ORDER BY booking_id").fetchall()
+
+    assert slots == [(2, "10:00:00", 1), (4, "11:00:00", 1), (6, "12:00:00", 0), (8, "13:00:00", 1)]
+    assert bookings == [(1, 2), (2, 4), (4, 8)]
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from src.core.scheduler import AsyncJobRunner
+from src.db.models import EmailVerification
+from src.jobs.otp_cleanup import delete_expired_otps
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 11, 4, 9, 0, tzinfo=tz)
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    """The shared SQLite session factory, seeded with five expired OTPs and one live one."""
+    now = datetime(2025, 11, 4, 9, 0)
+    async with session_factory() as db:
+        db.add_all([
+            EmailVerification(email=f"expired{i}@example.com", otp_code="123456",
+                              otp_expiry=now - timedelta(minutes=i + 1))
+            for i in range(5)
+        ])
+        db.add(EmailVerification(email="live@example.com", otp_code="654321", otp_expiry=now + timedelta(minutes=5)))
+        await db.commit()
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_expired_rows_in_bounded_chunks(session_factory):
+    with patch("src.jobs.otp_cleanup.async_session", session_factory), \
+            patch("src.jobs.otp_cleanup.datetime", FixedDatetime):
+        first = await delete_expired_otps(chunk_size=2, max_chunks=2)
+        second = await delete_expired_otps(chunk_size=2, max_chunks=2)
+        third = await delete_expired_otps(chunk_size=2, max_chunks=2)
+
+    async with session_factory() as db:
+        emails = (await db.execute(select(EmailVerification.email))).scalars().all()
+
+    assert (first["deleted"], first["chunks"], first["backlog"]) == (4, 2, True)
+    assert (second["deleted"], second["backlog"]) == (1, False)
+    assert third["deleted"] == 0
+    assert first["next_run_in"] < second["next_run_in"] < third["next_run_in"]
+    assert emails == ["live@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_failed_purge_is_raised_and_counted_by_the_runner(session_factory):
+    runner = AsyncJobRunner()
+    runner.add_job("delete_otps", delete_expired_otps, interval=3600)
+    with patch("src.jobs.otp_cleanup.async_session", session_factory), \
+            patch("src.repositories.user_repo.UserRepository.purge_expired_otps", side_effect=RuntimeError("locked")):
+        with pytest.raises(RuntimeError):
+            await delete_expired_otps()
+
+        runner.start()
+        runner.trigger("delete_otps")
+        await asyncio.sleep(0.05)
+        await runner.shutdown()
+
+    job = runner.stats()["jobs"][0]
+    assert (job["runs"], job["failures"], job["last_error"], job["next_delay_seconds"]) == (1, 1, "locked", None)
@@ -0,0 +1,86 @@
+import pytest
+
+from src.core.otp_store import MemoryOTPStore, OTPStore, RedisOTPStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Stands in for redis.asyncio.Redis: bytes values and per-key expiry on a fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = (value.encode(), self.clock() + ex if ex else None)
+
+    async def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_codes_and_evicts_them():
+    clock = FakeClock()
+    store = MemoryOTPStore(clock=clock)
+    await store.set("a@example.com", "111111", 600)
+    await store.set("b@example.com", "222222", 60)
+
+    clock.now += 61
+    assert await store.get("b@example.com") is None
+    assert await store.get("a@example.com") == "111111"
+    assert len(store) == 1
+
+    clock.now += 600
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_store_resend_replaces_code_and_expiry():
+    clock = FakeClock()
+    store = MemoryOTPStore(clock=clock)
+    await store.set("a@example.com", "111111", 60)
+    clock.now += 50
+    await store.set("a@example.com", "222222", 60)
+
+    clock.now += 20  # past the first expiry, inside the second
+    assert await store.get("a@example.com") == "222222"
+
+    await store.delete("a@example.com")
+    assert await store.get("a@example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_store_uses_prefixed_keys_with_ttl():
+    clock = FakeClock()
+    client = FakeRedis(clock)
+    store = RedisOTPStore(client)
+    await store.set("a@example.com", "111111", 600)
+
+    assert list(client.data) == ["otp:a@example.com"]
+    assert await store.get("a@example.com") == "111111"
+
+    clock.now += 601
+    assert await store.get("a@example.com") is None
+
+
+def test_backend_missing_a_method_fails_when_instantiated():
+    class PartialStore(OTPStore):
+        async def set(self, email, otp, ttl_seconds, db=None):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialStore()
@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from src.db.pool_metrics import PoolMetrics, instrumented_pool
+
+
+def _engine(tmp_path, metrics, **kwargs):
+    return create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        **kwargs,
+    )
+
+
+def test_checkouts_and_slow_waits_are_recorded(tmp_path):
+    metrics = PoolMetrics("test", wait_warn_ms=50)
+    engine = _engine(tmp_path, metrics, pool_timeout=5)
+
+    held = engine.connect()
+    threading.Timer(0.2, held.close).start()
+    started = time.perf_counter()
+    with engine.connect():
+        waited_ms = (time.perf_counter() - started) * 1000
+        stats = metrics.snapshot(engine.pool)
+
+    assert waited_ms >= 150
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 1
+    assert stats["slow_waits"] == 1
+    assert stats["max_wait_ms"] >= 150
+
+
+def test_pool_timeouts_are_counted(tmp_path):
+    metrics = PoolMetrics("test", wait_warn_ms=1000)
+    engine = _engine(tmp_path, metrics, pool_timeout=0.1)
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert metrics.snapshot(engine.pool)["timeouts"] == 1
@@ -0,0 +1,73 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pyinstrument import Profiler
+
+from src.core import profiling
+from src.core.profiling import RouteProfileStore, SamplingProfilerMiddleware, should_profile
+
+
+def _session():
+    profiler = Profiler()
+    profiler.start()
+    sum(i * i for i in range(20000))
+    return profiler.stop()
+
+
+@patch("src.core.profiling.PROFILING_SAMPLE_RATE", 0.0)
+@patch("src.core.profiling.PROFILING_ROUTES", ["/shops/"])
+def test_should_profile_chosen_routes_only_when_rate_is_zero():
+    assert should_profile("/shops/1/slots/") is True
+    assert should_profile("/menu/shop/1") is False
+
+
+def test_hot_routes_ranked_by_total_time():
+    store = RouteProfileStore()
+    store.record("GET /shops/", _session(), 10.0)
+    store.record("GET /menu/shop/{shop_id}", _session(), 4.0)
+    store.record("GET /menu/shop/{shop_id}", _session(), 30.0)
+
+    hot = store.hot_routes()
+
+    assert [r["route"] for r in hot] == ["GET /menu/shop/{shop_id}", "GET /shops/"]
+    assert hot[0]["samples"] == 2
+    assert hot[0]["avg_ms"] == 17.0
+    assert hot[0]["max_ms"] == 30.0
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_merged_report_per_route(tmp_path):
+    store = RouteProfileStore(report_dir=str(tmp_path))
+    store.record("GET /shops/", _session(), 5.0)
+    store.record("GET /shops/", _session(), 5.0)
+
+    assert await store.flush() == ["GET /shops/"]
+    assert await store.flush() == []
+    assert os.path.exists(tmp_path / "GET_shops.txt")
+    assert store.report("GET /shops/") is not None
+
+
+@patch("src.core.profiling.PROFILING_SAMPLE_RATE", 1.0)
+def test_middleware_records_route_template():
+    store = RouteProfileStore()
+    app = FastAPI()
+    app.add_middleware(SamplingProfilerMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    with patch.object(profiling, "profile_store", store):
+        response = TestClient(app).get("/items/3")
+
+    assert response.status_code == 200
+    assert store.hot_routes()[0]["route"] == "GET /items/{item_id}"
+
+
+def test_admin_routes_are_not_mounted_by_default():
+    from main import app
+
+    assert TestClient(app).get("/admin/profiling/hot-routes").status_code == 404
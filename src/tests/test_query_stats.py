@@ -0,0 +1,119 @@
+from datetime import time
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, inspect, select
+
+from src.core.otp_store import DatabaseOTPStore
+from src.db.models import Barber, EmailOutbox, EmailVerification, Menu, Shop, User
+from src.db.query_stats import QueryStatsMiddleware, check_query_stats, current_query_stats, \
+    statement_shape, track_queries
+from src.schemas.barber_schemas import BarberUpdate
+from src.services.barber_service import BarberService
+from src.services.menu_service import MenuService
+from src.services.user_service import UserService
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    """The shared SQLite session factory, seeded with an owner, a shop, a barber and a menu item."""
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", email="owner@example.com", role="owner"))
+        db.add(Shop(shop_id=1, owner_id=1, shop_name="Open", address="A", city="Hyderabad", state="TS",
+                    open_time=time(9), close_time=time(18)))
+        db.add(Barber(barber_id=1, shop_id=1, barber_name="Ravi", start_time=time(9), end_time=time(18)))
+        db.add(Menu(menu_id=1, shop_id=1, service_name="Shave", price=100, duration_minutes=15))
+        await db.commit()
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_add_menu_item_commits_once_without_refresh(session_factory):
+    async with session_factory() as db:
+        with track_queries() as stats:
+            menu = await MenuService.add_menu_item(db, owner_id=1, shop_id=1, service_name="Haircut",
+                                                   description="Classic", price=250.0, duration_minutes=30)
+
+    # ownership check + duplicate check + INSERT, then a single COMMIT; no SELECT to refresh
+    assert (stats.statements, stats.commits, stats.rollbacks) == (3, 1, 0)
+    assert menu.menu_id is not None
+    assert menu.created_at is not None and menu.is_active is True
+    assert not inspect(menu).expired_attributes
+
+
+@pytest.mark.asyncio
+async def test_statements_outside_a_tracked_block_are_not_counted(session_factory):
+    async with session_factory() as db:
+        await MenuService.get_shop_menu(db, 1)
+        with track_queries() as stats:
+            await MenuService.get_shop_menu(db, 1)
+
+    assert stats.statements == 1
+
+
+@pytest.mark.asyncio
+async def test_owner_mutations_check_ownership_in_the_loading_query(session_factory):
+    async with session_factory() as db:
+        with track_queries() as menu_stats:
+            await MenuService.update_menu_item(db, owner_id=1, menu_id=1, price=120.0)
+        with patch("src.services.barber_service.enqueue_barber_slot_refresh"), track_queries() as barber_stats:
+            await BarberService.update_barber(db, 1, owner_id=1, data=BarberUpdate(barber_name="Ravi K"))
+
+    # one SELECT joined to the shop for the row and its owner, then the UPDATE
+    assert (menu_stats.statements, menu_stats.commits) == (2, 1)
+    assert (barber_stats.statements, barber_stats.commits) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_shapes_are_flagged_as_n_plus_one(session_factory):
+    async with session_factory() as db:
+        with track_queries() as stats:
+            for shop_id in range(1, 7):
+                await MenuService.get_shop_menu(db, shop_id)
+
+    warnings = check_query_stats("GET /loop", stats, budget=5, repeat_threshold=5)
+
+    assert stats.statements == 6 and stats.db_time_ms > 0
+    assert warnings[0] == "GET /loop issued 6 statements, over the budget of 5"
+    assert warnings[1].startswith("GET /loop ran the same statement 6 times (N+1?): SELECT menu.menu_id")
+    assert check_query_stats("GET /loop", stats, budget=10, repeat_threshold=10) == []
+
+
+def test_statement_shape_collapses_whitespace_and_placeholder_lists():
+    assert statement_shape("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT a FROM t WHERE id IN (?)"
+    assert statement_shape("INSERT INTO t VALUES (%s, %s), (%s, %s)") == "INSERT INTO t VALUES (?), (?)"
+
+
+def test_middleware_adds_db_headers_when_enabled():
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        current_query_stats().statements += 2
+        return []
+
+    app.add_middleware(QueryStatsMiddleware, headers=True)
+    response = TestClient(app).get("/items")
+
+    assert response.headers["x-db-statements"] == "2"
+    assert "x-db-time-ms" in response.headers
+
+
+@pytest.mark.asyncio
+@patch("src.services.user_service.wake_email_outbox")
+@patch("src.services.user_service.otp_store", new_callable=DatabaseOTPStore)
+async def test_otp_row_and_outbox_message_share_one_commit(store, mock_wake, session_factory):
+    async with session_factory() as db:
+        with track_queries() as stats:
+            await UserService.send_verification_otp(db, "owner@example.com")
+
+    async with session_factory() as db:
+        otp_rows = (await db.execute(select(func.count()).select_from(EmailVerification))).scalar_one()
+        outbox_rows = (await db.execute(select(func.count()).select_from(EmailOutbox))).scalar_one()
+
+    assert stats.commits == 1
+    assert (otp_rows, outbox_rows) == (1, 1)
+    mock_wake.assert_called_once()
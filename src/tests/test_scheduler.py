@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from src.core.scheduler import AsyncJobRunner
+from src.db.query_stats import current_query_stats
+
+
+@pytest.mark.asyncio
+async def test_trigger_during_run_is_folded_into_one_follow_up_run():
+    runner = AsyncJobRunner()
+    started, release = asyncio.Event(), asyncio.Event()
+    calls = []
+
+    async def job():
+        calls.append(len(calls))
+        started.set()
+        await release.wait()
+
+    runner.add_job("job", job, interval=3600)
+    runner.start()
+    runner.trigger("job")
+    await started.wait()
+    for _ in range(5):
+        runner.trigger("job")
+    release.set()
+    await asyncio.sleep(0.05)
+    await runner.shutdown()
+
+    assert len(calls) == 2
+    assert runner.stats()["jobs"][0]["runs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_overrunning_job_coalesces_missed_intervals():
+    runner = AsyncJobRunner()
+    calls = []
+
+    async def slow_job():
+        calls.append(1)
+        await asyncio.sleep(0.12)
+
+    runner.add_job("slow", slow_job, interval=0.02)
+    runner.start()
+    await asyncio.sleep(0.35)
+    await runner.shutdown()
+
+    stats = runner.stats()["jobs"][0]
+    assert stats["coalesced"] >= 1
+    assert len(calls) <= 3
+
+
+@pytest.mark.asyncio
+async def test_job_timeout_is_recorded_as_failure():
+    runner = AsyncJobRunner()
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    runner.add_job("hangs", hangs, interval=3600, timeout=0.01)
+    runner.start()
+    runner.trigger("hangs")
+    await asyncio.sleep(0.05)
+    await runner.shutdown()
+
+    stats = runner.stats()["jobs"][0]
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "timed out after 0.01s"
+
+
+@pytest.mark.asyncio
+async def test_submit_dedupes_by_key_and_is_ignored_before_start():
+    runner = AsyncJobRunner()
+    calls = []
+
+    async def refresh(barber_id):
+        calls.append(barber_id)
+        await asyncio.sleep(0.02)
+
+    runner.submit("slot_refresh_1", refresh, 1)
+    assert calls == []
+
+    runner.start()
+    for _ in range(4):
+        runner.submit("slot_refresh_1", refresh, 1)
+    runner.submit("slot_refresh_2", refresh, 2)
+    await asyncio.sleep(0.1)
+    await runner.shutdown()
+
+    assert sorted(calls) == [1, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_job_can_choose_its_next_delay():
+    runner = AsyncJobRunner()
+    calls = []
+
+    async def backs_off():
+        calls.append(1)
+        return {"next_run_in": 3600}
+
+    runner.add_job("backs_off", backs_off, interval=0.01)
+    runner.start()
+    await asyncio.sleep(0.1)
+    await runner.shutdown()
+
+    assert len(calls) == 1
+    assert runner.stats()["jobs"][0]["next_delay_seconds"] == 3600
+
+
+@pytest.mark.asyncio
+async def test_each_run_records_the_statements_its_job_issued():
+    runner = AsyncJobRunner()
+    done = asyncio.Event()
+
+    async def job():
+        current_query_stats().statements += 3
+        done.set()
+
+    runner.add_job("job", job, interval=3600)
+    runner.start()
+    runner.trigger("job")
+    await done.wait()
+    await asyncio.sleep(0.01)
+    await runner.shutdown()
+
+    assert runner.stats()["jobs"][0]["last_queries"]["statements"] == 3
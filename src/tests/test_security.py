@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.security import BoundedHashPool, hash_password_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_hash_round_trip():
+    hashed = await hash_password_async("s3cret")
+
+    assert await verify_password_async("s3cret", hashed) is True
+    assert await verify_password_async("wrong", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_saturated():
+    pool = BoundedHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    assert pool.stats()["in_flight"] == 2
+    assert pool.stats()["queue_depth"] == 1
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(release.wait)
+    assert exc.value.status_code == 503
+
+    release.set()
+    await asyncio.gather(*running)
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_callers_keep_their_slot_until_the_thread_finishes():
+    pool = BoundedHashPool(workers=1, max_queue=0)
+    release = threading.Event()
+
+    waiting = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0.05)
+    waiting.cancel()
+    await asyncio.sleep(0.05)
+
+    # The bcrypt call is still running in its thread, so the pool is still full
+    assert pool.stats()["in_flight"] == 1
+    with pytest.raises(HTTPException):
+        await pool.run(release.wait)
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert pool.stats()["in_flight"] == 0
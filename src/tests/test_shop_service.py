@@ -1,6 +1,15 @@
 import pytest
 from unittest.mock import AsyncMock, patch
-from fastapi import HTTPException
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+import json
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from main import app
+from src.api.routers import shop_routes
+from src.db.database import get_db
+from src.db.models import Barber, BarberSlot, Menu, Shop, User
 from src.services.shop_service import ShopService
 
 
@@ -8,7 +17,7 @@ from src.services.shop_service import ShopService
 @patch("src.services.shop_service.ShopRepository", autospec=True)
 async def test_get_shops_for_user_success(mock_repo):
     mock_db = AsyncMock()
-    mock_repo.get_all_shops.return_value = [
+    mock_repo.get_shops_page.return_value = [
         AsyncMock(
             shop_id=1,
             shop_name="Salon Bliss",
@@ -21,21 +30,22 @@ async def test_get_shops_for_user_success(mock_repo):
         )
     ]
 
-    result = await ShopService.get_shops_for_user(mock_db)
+    result, next_cursor = await ShopService.get_shops_for_user(mock_db, limit=10)
 
     assert isinstance(result, list)
     assert result[0]["shop_name"] == "Salon Bliss"
     assert result[0]["is_open"] is True
+    assert next_cursor is None
 
 
 @pytest.mark.asyncio
 @patch("src.services.shop_service.ShopRepository", autospec=True)
 async def test_get_shops_for_user_no_shops(mock_repo):
     mock_db = AsyncMock()
-    mock_repo.get_all_shops.side_effect = HTTPException(status_code=404, detail="No shops found")
+    mock_repo.get_shops_page.return_value = []
 
     with pytest.raises(HTTPException) as exc:
-        await ShopService.get_shops_for_user(mock_db)
+        await ShopService.get_shops_for_user(mock_db, limit=10)
 
     assert exc.value.status_code == 404
     assert "No shops found" in exc.value.detail
@@ -172,22 +182,26 @@ async def test_create_shop_if_not_exists_duplicate(mock_repo):
 @patch("src.services.shop_service.ShopRepository", autospec=True)
 async def test_book_slots_success(mock_repo):
     mock_db = AsyncMock()
-    slot_mock = AsyncMock(slot_id=1, slot_date="2025-11-04", slot_time="10:00", is_booked=False)
-    mock_repo.get_slot_by_id.return_value = slot_mock
-    mock_repo.create_booking.return_value = AsyncMock()
+    mock_repo.get_slots_by_ids.return_value = [
+        AsyncMock(slot_id=1, barber_id=2, slot_date="2025-11-04", slot_time="10:00", is_booked=False),
+        AsyncMock(slot_id=2, barber_id=2, slot_date="2025-11-04", slot_time="11:00", is_booked=False),
+    ]
+    mock_repo.claim_slots.return_value = 2
 
-    result = await ShopService.book_slots(mock_db, 1, 2, 3, [1])
+    result = await ShopService.book_slots(mock_db, 1, 2, 3, [1, 2])
 
-    assert result["message"] == "1 slots booked successfully"
-    assert len(result["booked_slots"]) == 1
+    assert result["message"] == "2 slots booked successfully"
+    assert [s["slot_id"] for s in result["booked_slots"]] == [1, 2]
     assert result["booked_slots"][0]["status"] == "booked"
+    assert len(mock_repo.create_bookings.call_args.args[1]) == 2
+    mock_db.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 @patch("src.services.shop_service.ShopRepository", autospec=True)
 async def test_book_slots_slot_not_found(mock_repo):
     mock_db = AsyncMock()
-    mock_repo.get_slot_by_id.return_value = None
+    mock_repo.get_slots_by_ids.return_value = []
 
     with pytest.raises(HTTPException) as exc:
         await ShopService.book_slots(mock_db, 1, 2, 3, [99])
@@ -200,11 +214,253 @@ async def test_book_slots_slot_not_found(mock_repo):
 @patch("src.services.shop_service.ShopRepository", autospec=True)
 async def test_book_slots_already_booked(mock_repo):
     mock_db = AsyncMock()
-    slot_mock = AsyncMock(slot_id=1, is_booked=True)
-    mock_repo.get_slot_by_id.return_value = slot_mock
+    mock_repo.get_slots_by_ids.return_value = [AsyncMock(slot_id=1, barber_id=2, is_booked=True)]
 
     with pytest.raises(HTTPException) as exc:
         await ShopService.book_slots(mock_db, 1, 2, 3, [1])
 
     assert exc.value.status_code == 400
     assert "already booked" in exc.value.detail
+    mock_repo.claim_slots.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_book_slots_rejects_batch_when_slot_taken_concurrently(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_slots_by_ids.return_value = [
+        AsyncMock(slot_id=1, barber_id=2, is_booked=False),
+        AsyncMock(slot_id=2, barber_id=2, is_booked=False),
+    ]
+    mock_repo.claim_slots.return_value = 1
+
+    with pytest.raises(HTTPException) as exc:
+        await ShopService.book_slots(mock_db, 1, 2, 3, [1, 2])
+
+    assert exc.value.status_code == 409
+    mock_repo.create_bookings.assert_not_called()
+    mock_db.rollback.assert_awaited_once()
+    mock_db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_book_slots_unique_violation_maps_to_conflict(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_slots_by_ids.return_value = [AsyncMock(slot_id=1, barber_id=2, is_booked=False)]
+    mock_repo.claim_slots.return_value = 1
+    mock_repo.create_bookings.side_effect = IntegrityError("INSERT", {}, Exception("uq_booking_slot"))
+
+    with pytest.raises(HTTPException) as exc:
+        await ShopService.book_slots(mock_db, 1, 2, 3, [1])
+
+    assert exc.value.status_code == 409
+    mock_db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_book_slots_foreign_key_violation_is_not_reported_as_conflict(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_slots_by_ids.return_value = [AsyncMock(slot_id=1, barber_id=2, is_booked=False)]
+    mock_repo.claim_slots.return_value = 1
+    mock_repo.create_bookings.side_effect = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+
+    with pytest.raises(IntegrityError):
+        await ShopService.book_slots(mock_db, 1, 2, 3, [1])
+
+    mock_db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_book_slots_unknown_user(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_user_by_id.return_value = None
+
+    with pytest.raises(HTTPException) as exc:
+        await ShopService.book_slots(mock_db, 99, 2, 3, [1])
+
+    assert exc.value.status_code == 404
+    assert "User not found" in exc.value.detail
+    mock_repo.claim_slots.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_book_slots_rejects_slot_of_another_barber(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_slots_by_ids.return_value = [AsyncMock(slot_id=1, barber_id=5, is_booked=False)]
+
+    with pytest.raises(HTTPException) as exc:
+        await ShopService.book_slots(mock_db, 1, 2, 3, [1])
+
+    assert exc.value.status_code == 400
+    assert "does not belong to barber 2" in exc.value.detail
+    mock_repo.claim_slots.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_shop_listing_is_cached_until_a_shop_is_created(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_shops_page.return_value = [
+        AsyncMock(shop_id=1, shop_name="Salon Bliss", address="Main Street", city="Hyderabad",
+                  state="Telangana", open_time="09:00", close_time="18:00", is_open=True)
+    ]
+    mock_repo.get_user_by_id.return_value = AsyncMock(role="owner")
+    mock_repo.get_existing_shop.return_value = None
+    mock_repo.create_shop.return_value = AsyncMock(shop_id=2)
+
+    await ShopService.get_shops_for_user(mock_db, limit=10)
+    await ShopService.get_shops_for_user(mock_db, limit=10)
+    assert mock_repo.get_shops_page.await_count == 1
+
+    shop_data = AsyncMock(shop_name="New", address="X", city="Y", state="Z", open_time="09:00", close_time="18:00")
+    await ShopService.create_shop_if_not_exists(mock_db, 1, shop_data)
+    await ShopService.get_shops_for_user(mock_db, limit=10)
+    assert mock_repo.get_shops_page.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shop_pages_follow_the_cursor_with_filters(session_factory):
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", role="owner"))
+        db.add_all([
+            Shop(shop_id=i, owner_id=1, shop_name=f"Shop {i}", address="A", city="Hyderabad" if i % 2 else "Pune",
+                 state="TS", open_time=time(9), close_time=time(18), is_open=i != 5)
+            for i in range(1, 12)
+        ])
+        await db.commit()
+
+        pages, cursor = [], None
+        while True:
+            page, cursor = await ShopService.get_shops_for_user(db, 2, cursor, city="Hyderabad", is_open=True)
+            pages.append([shop["shop_id"] for shop in page])
+            if cursor is None:
+                break
+
+    assert pages == [[1, 3], [7, 9], [11]]
+
+
+@pytest.mark.asyncio
+async def test_stream_slot_range_groups_by_date_and_barber(session_factory):
+    day_one, day_two = date(2025, 11, 4), date(2025, 11, 5)
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", role="owner"))
+        db.add(Shop(shop_id=1, owner_id=1, shop_name="Open", address="A", city="Hyderabad", state="TS",
+                    open_time=time(9), close_time=time(18)))
+        db.add_all([
+            Barber(barber_id=b, barber_name=name, shop_id=1, start_time=time(9), end_time=time(18))
+            for b, name in ((1, "Ravi"), (2, "Sai"))
+        ])
+        db.add_all([
+            BarberSlot(barber_id=b, shop_id=1, slot_date=d, slot_time=time(h), status="available", is_booked=False)
+            for d in (day_one, day_two) for b in (1, 2) for h in (9, 10)
+        ])
+        db.add(BarberSlot(barber_id=1, shop_id=1, slot_date=day_two, slot_time=time(11), status="booked", is_booked=True))
+        await db.commit()
+
+        chunks = [c async for c in ShopService.stream_slot_range(db, 1, day_one, day_two)]
+        body = json.loads("".join(chunks))
+        available = json.loads("".join(
+            [c async for c in ShopService.stream_slot_range(db, 1, day_two, day_two, barber_id=1, only_available=True)]
+        ))
+        empty = json.loads("".join([c async for c in ShopService.stream_slot_range(db, 1, date(2026, 1, 1),
+                                                                                    date(2026, 1, 2))]))
+
+    assert [d["date"] for d in body["days"]] == ["2025-11-04", "2025-11-05"]
+    assert [b["barber_name"] for b in body["days"][1]["barbers"]] == ["Ravi", "Sai"]
+    assert [s["slot_time"] for s in body["days"][1]["barbers"][0]["slots"]] == ["09:00:00", "10:00:00", "11:00:00"]
+    assert [s["slot_time"] for s in available["days"][0]["barbers"][0]["slots"]] == ["09:00:00", "10:00:00"]
+    assert empty["days"] == []
+
+
+def test_slot_range_is_bounded():
+    with pytest.raises(HTTPException) as exc:
+        ShopService.validate_slot_range(date(2025, 11, 5), date(2025, 11, 4))
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        ShopService.validate_slot_range(date(2025, 11, 1), date(2026, 1, 1))
+    assert "limited" in exc.value.detail
+
+
+@pytest.mark.asyncio
+@patch("src.services.shop_service.ShopRepository", autospec=True)
+async def test_compact_slots_group_per_barber_with_booked_bitmask(mock_repo):
+    mock_db = AsyncMock()
+    mock_repo.get_available_slots.return_value = [
+        SimpleNamespace(slot_id=11, barber_id=1, barber_name="Ravi", slot_time=time(9), status="available"),
+        SimpleNamespace(slot_id=12, barber_id=1, barber_name="Ravi", slot_time=time(10), status="booked"),
+        SimpleNamespace(slot_id=13, barber_id=1, barber_name="Ravi", slot_time=time(11, 30), status="booked"),
+        SimpleNamespace(slot_id=21, barber_id=2, barber_name="Sai", slot_time=time(9), status="available"),
+    ]
+
+    result = await ShopService.get_available_slots_compact(mock_db, 1, "2025-11-04")
+
+    assert result == {
+        "shop_id": 1,
+        "date": "2025-11-04",
+        "barbers": [
+            {"barber_id": 1, "barber_name": "Ravi", "slot_ids": [11, 12, 13], "start_minutes": [540, 600, 690],
+             "booked": 0b110},
+            {"barber_id": 2, "barber_name": "Sai", "slot_ids": [21], "start_minutes": [540], "booked": 0},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_earliest_slots_across_shops(session_factory):
+    day = date(2025, 11, 4)
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", role="owner"))
+        for shop_id, city, is_open, service in ((1, "Hyderabad", True, "Haircut"), (2, "Hyderabad", True, "Shave"),
+                                                (3, "Pune", True, "Haircut"), (4, "Hyderabad", False, "Haircut")):
+            db.add(Shop(shop_id=shop_id, owner_id=1, shop_name=f"Shop {shop_id}", address="A", city=city, state="X",
+                        open_time=time(9), close_time=time(21), is_open=is_open))
+            db.add(Barber(barber_id=shop_id, barber_name=f"Barber {shop_id}", shop_id=shop_id,
+                          start_time=time(9), end_time=time(21)))
+            db.add(Menu(shop_id=shop_id, service_name=f"Men's {service}", price=200, duration_minutes=30))
+            db.add_all([
+                BarberSlot(barber_id=shop_id, shop_id=shop_id, slot_date=d, slot_time=time(h), status="available",
+                           is_booked=(shop_id, d, h) == (1, day, 17))
+                for d in (day, date(2025, 11, 5)) for h in (16, 17, 18)
+            ])
+        await db.commit()
+
+        results = await ShopService.find_earliest_slots(db, 3, after=datetime(2025, 11, 4, 17, 0),
+                                                        city="Hyderabad", service="haircut")
+
+    assert [(r["shop_id"], r["slot_date"], r["slot_time"]) for r in results] == [
+        (1, "2025-11-04", "18:00:00"), (1, "2025-11-05", "16:00:00"), (1, "2025-11-05", "17:00:00")
+    ]
+
+
+@patch("src.api.routers.shop_routes.ShopService", autospec=True)
+def test_shops_route_returns_service_output_with_cursor_header(mock_service):
+    app = FastAPI()
+    app.include_router(shop_routes.router)
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    page = [{"shop_id": 7, "shop_name": "Fade Lab", "address": "A", "city": "Pune", "state": "MH",
+             "open_time": "09:00:00", "close_time": "18:00:00", "is_open": True}]
+    mock_service.get_shops_for_user.return_value = (page, 7)
+
+    response = TestClient(app).get("/shops/?limit=1")
+
+    assert response.status_code == 200
+    assert response.json() == page
+    assert response.headers["x-next-cursor"] == "7"
+
+
+@patch("src.api.routers.shop_routes.ShopService", autospec=True)
+def test_cross_origin_clients_can_read_the_cursor_header(mock_service):
+    mock_service.get_shops_for_user.return_value = ([], 42)
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    try:
+        response = TestClient(app).get("/shops/", headers={"Origin": "http://localhost:3000"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["x-next-cursor"] == "42"
+    assert "X-Next-Cursor" in response.headers["access-control-expose-headers"]
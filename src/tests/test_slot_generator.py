@@ -0,0 +1,194 @@
+import asyncio
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from src.core.scheduler import AsyncJobRunner
+from src.db.models import Barber, BarberAvailability, BarberSlot, Shop, User
+from src.jobs.slot_generator import _missing_slots, generate_barber_slots, refresh_barber_slots
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 11, 4, 8, 0)
+
+
+@pytest_asyncio.fixture
+async def session_factory(session_factory):
+    """The shared SQLite session factory, seeded with two shops (one closed) and three barbers."""
+
+    async with session_factory() as db:
+        db.add(User(id=1, username="owner", role="owner"))
+        db.add_all([
+            Shop(shop_id=1, owner_id=1, shop_name="Open", address="A", city="Hyderabad", state="TS",
+                 open_time=time(9), close_time=time(18), is_open=True),
+            Shop(shop_id=2, owner_id=1, shop_name="Closed", address="B", city="Hyderabad", state="TS",
+                 open_time=time(9), close_time=time(18), is_open=False),
+        ])
+        db.add_all([
+            Barber(barber_id=1, barber_name="Ravi", shop_id=1, start_time=time(0), end_time=time(23),
+                   is_available=True, generate_daily=True),
+            Barber(barber_id=2, barber_name="Kiran", shop_id=2, start_time=time(0), end_time=time(23),
+                   is_available=True, generate_daily=True),
+            Barber(barber_id=3, barber_name="Sai", shop_id=1, start_time=time(0), end_time=time(23),
+                   is_available=False, generate_daily=True),
+        ])
+        await db.commit()
+    return session_factory
+
+
+def test_missing_slots_skips_existing_and_past_slots():
+    barber = SimpleNamespace(barber_id=1, shop_id=7, start_time=time(9), end_time=time(13))
+    day = date(2025, 11, 4)
+    existing = {(1, day, time(11))}
+
+    rows = _missing_slots([barber], existing, [day], now_dt=datetime(2025, 11, 4, 9, 30))
+
+    assert [r["slot_time"] for r in rows] == [time(9), time(10), time(12)]
+    assert all(r["shop_id"] == 7 and r["status"] == "available" for r in rows)
+
+
+def test_missing_slots_honors_availability_overrides():
+    barber = SimpleNamespace(barber_id=1, shop_id=7, start_time=time(9), end_time=time(12))
+    day_one, day_two = date(2025, 11, 4), date(2025, 11, 5)
+    overrides = {
+        (1, day_one): SimpleNamespace(is_available=True, start_time=time(10), end_time=None),
+        (1, day_two): SimpleNamespace(is_available=False, start_time=None, end_time=None),
+    }
+
+    rows = _missing_slots([barber], set(), [day_one, day_two], datetime(2025, 11, 4, 8, 0), overrides)
+
+    assert [(r["slot_date"], r["slot_time"]) for r in rows] == [(day_one, time(10)), (day_one, time(11))]
+
+
+@pytest.mark.asyncio
+async def test_generate_barber_slots_only_for_eligible_barbers(session_factory):
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator.SLOT_HORIZON_DAYS", 2), \
+            patch("src.jobs.slot_generator.datetime", FixedDatetime):
+        first = await generate_barber_slots()
+        second = await generate_barber_slots()
+
+    async with session_factory() as db:
+        barber_ids = {row.barber_id for row in (await db.execute(select(BarberSlot.barber_id))).all()}
+
+    assert first["created"] == 15 + 23
+    assert second["created"] == 0
+    assert barber_ids == {1}
+
+
+@pytest.mark.asyncio
+async def test_generate_barber_slots_skips_day_off(session_factory):
+    async with session_factory() as db:
+        db.add(BarberAvailability(barber_id=1, available_date=date(2025, 11, 5), is_available=False))
+        await db.commit()
+
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator.SLOT_HORIZON_DAYS", 2), \
+            patch("src.jobs.slot_generator.datetime", FixedDatetime):
+        result = await generate_barber_slots()
+
+    async with session_factory() as db:
+        dates = {row.slot_date for row in (await db.execute(select(BarberSlot.slot_date))).all()}
+
+    assert result["created"] == 15
+    assert dates == {date(2025, 11, 4)}
+
+
+@pytest.mark.asyncio
+async def test_refresh_barber_slots_retires_unbooked_slots_outside_new_hours(session_factory):
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator.SLOT_HORIZON_DAYS", 1), \
+            patch("src.jobs.slot_generator.datetime", FixedDatetime):
+        await generate_barber_slots()
+
+        async with session_factory() as db:
+            booked = (await db.execute(select(BarberSlot).filter(BarberSlot.slot_time == time(20)))).scalar_one()
+            booked.is_booked = True
+            booked.status = "booked"
+            barber = await db.get(Barber, 1)
+            barber.start_time, barber.end_time = time(10), time(12)
+            await db.commit()
+
+        result = await refresh_barber_slots(1)
+
+    async with session_factory() as db:
+        times = sorted(row.slot_time for row in (await db.execute(select(BarberSlot.slot_time))).all())
+
+    assert result == {"created": 0, "retired": 12, "elapsed_ms": result["elapsed_ms"]}
+    assert times == [time(10), time(11), time(20)]
+
+
+@pytest.mark.asyncio
+async def test_periodic_pass_retires_slots_on_a_day_off_added_after_generation(session_factory):
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator.SLOT_HORIZON_DAYS", 2), \
+            patch("src.jobs.slot_generator.datetime", FixedDatetime):
+        await generate_barber_slots()
+
+        async with session_factory() as db:
+            booked = (await db.execute(select(BarberSlot).filter(
+                BarberSlot.slot_date == date(2025, 11, 5), BarberSlot.slot_time == time(12)
+            ))).scalar_one()
+            booked.is_booked = True
+            booked.status = "booked"
+            db.add(BarberAvailability(barber_id=1, available_date=date(2025, 11, 5), is_available=False))
+            await db.commit()
+
+        result = await generate_barber_slots()
+
+    async with session_factory() as db:
+        day_off = (await db.execute(
+            select(BarberSlot.slot_time).filter(BarberSlot.slot_date == date(2025, 11, 5))
+        )).all()
+
+    assert (result["created"], result["retired"]) == (0, 22)
+    assert [row.slot_time for row in day_off] == [time(12)]
+
+
+@pytest.mark.asyncio
+async def test_periodic_pass_retires_free_slots_of_a_barber_made_unavailable(session_factory):
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator.SLOT_HORIZON_DAYS", 1), \
+            patch("src.jobs.slot_generator.datetime", FixedDatetime):
+        await generate_barber_slots()
+
+        async with session_factory() as db:
+            booked = (await db.execute(select(BarberSlot).filter(BarberSlot.slot_time == time(20)))).scalar_one()
+            booked.is_booked = True
+            booked.status = "booked"
+            barber = await db.get(Barber, 1)
+            barber.is_available = False
+            await db.commit()
+
+        # No refresh_barber_slots: the periodic pass alone has to catch up
+        result = await generate_barber_slots()
+
+    async with session_factory() as db:
+        times = [row.slot_time for row in (await db.execute(select(BarberSlot.slot_time))).all()]
+
+    assert (result["created"], result["retired"]) == (0, 14)
+    assert times == [time(20)]
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_raised_and_counted_by_the_runner(session_factory):
+    runner = AsyncJobRunner()
+    runner.add_job("slot_agent", generate_barber_slots, interval=3600)
+    with patch("src.jobs.slot_generator.async_session", session_factory), \
+            patch("src.jobs.slot_generator._missing_slots", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            await generate_barber_slots()
+
+        runner.start()
+        runner.trigger("slot_agent")
+        await asyncio.sleep(0.05)
+        await runner.shutdown()
+
+    job = runner.stats()["jobs"][0]
+    assert (job["runs"], job["failures"], job["last_error"]) == (1, 1, "boom")
@@ -1,12 +1,13 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import HTTPException
+from src.core.otp_store import MemoryOTPStore
 from src.services.user_service import UserService
 
 
 @pytest.mark.asyncio
 @patch("src.services.user_service.UserRepository", autospec=True)
-@patch("src.services.user_service.hash_password", return_value="hashed_pw")
+@patch("src.services.user_service.hash_password_async", new_callable=AsyncMock, return_value="hashed_pw")
 async def test_register_user_success(mock_hash, mock_repo):
     mock_db = AsyncMock()
 
@@ -42,16 +43,18 @@ async def test_register_user_duplicate_email(mock_repo):
 
 
 @pytest.mark.asyncio
-@patch("src.services.user_service.send_email_otp", new_callable=AsyncMock)
+@patch("src.services.user_service.otp_store", new_callable=MemoryOTPStore)
+@patch("src.services.user_service.queue_email_otp", new_callable=AsyncMock)
 @patch("src.services.user_service.UserRepository", autospec=True)
-async def test_send_verification_otp_success(mock_repo, mock_send_email):
+async def test_send_verification_otp_success(mock_repo, mock_send_email, store):
     mock_db = AsyncMock()
     mock_repo.get_user_by_email.return_value = AsyncMock()
-    mock_repo.store_otp.return_value = AsyncMock()
 
     result = await UserService.send_verification_otp(mock_db, "test@example.com")
 
+    otp = await store.get("test@example.com")
     assert result["message"] == "Verification OTP sent to your email"
+    mock_send_email.assert_awaited_once_with(mock_db, "test@example.com", otp)
 
 
 @pytest.mark.asyncio
@@ -68,7 +71,7 @@ async def test_send_verification_otp_user_not_found(mock_repo):
 
 
 @pytest.mark.asyncio
-@patch("src.services.user_service.verify_password", return_value=True)
+@patch("src.services.user_service.verify_password_async", new_callable=AsyncMock, return_value=True)
 @patch("src.services.user_service.UserRepository", autospec=True)
 async def test_login_with_password_success(mock_repo, mock_verify):
     mock_db = AsyncMock()
@@ -84,7 +87,7 @@ async def test_login_with_password_success(mock_repo, mock_verify):
 
 
 @pytest.mark.asyncio
-@patch("src.services.user_service.verify_password", return_value=False)
+@patch("src.services.user_service.verify_password_async", new_callable=AsyncMock, return_value=False)
 @patch("src.services.user_service.UserRepository", autospec=True)
 async def test_login_with_password_invalid(mock_repo, mock_verify):
     mock_db = AsyncMock()
@@ -99,3 +102,23 @@ async def test_login_with_password_invalid(mock_repo, mock_verify):
 
     assert exc.value.status_code == 401
     assert "Invalid password" in exc.value.detail
+
+
+@pytest.mark.asyncio
+@patch("src.services.user_service.otp_store", new_callable=MemoryOTPStore)
+@patch("src.services.user_service.UserRepository", autospec=True)
+async def test_login_with_otp_consumes_the_code(mock_repo, store):
+    mock_db = AsyncMock()
+    mock_repo.get_user_by_email.return_value = MagicMock(id=7, role="customer")
+    await store.set("test@example.com", "123456", 600)
+
+    with pytest.raises(HTTPException) as exc:
+        await UserService.login_with_otp(mock_db, "test@example.com", "000000")
+    assert exc.value.status_code == 400
+
+    result = await UserService.login_with_otp(mock_db, "test@example.com", "123456")
+    assert result["user_id"] == 7
+
+    with pytest.raises(HTTPException) as exc:
+        await UserService.login_with_otp(mock_db, "test@example.com", "123456")
+    assert exc.value.status_code == 404
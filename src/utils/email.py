@@ -1,19 +1,16 @@
-import smtplib
-from fastapi import HTTPException
-from src.core.logger import logger
-from src.core.config import SMTP_EMAIL, SMTP_PASSWORD
+from src.repositories.outbox_repo import EmailOutboxRepository
+from src.core.config import OTP_TTL_SECONDS
 
-async def send_email_otp(receiver_email: str, otp: str):
-    subject = "Your OTP Verification Code"
-    body = f"Your OTP is {otp}. It will expire in 5 minutes."
-    message = f"Subject: {subject}\n\n{body}"
+OTP_SUBJECT = "Your OTP Verification Code"
 
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(SMTP_EMAIL, SMTP_PASSWORD)
-            server.sendmail(SMTP_EMAIL, receiver_email, message)
-        logger.info(f"OTP sent successfully to {receiver_email}")
-    except Exception as e:
-        logger.error(f"Failed to send OTP to {receiver_email}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to send OTP. Try again later.")
+
+def build_otp_body(otp: str) -> str:
+    return f"Your OTP is {otp}. It will expire in {OTP_TTL_SECONDS // 60} minutes."
+
+
+async def queue_email_otp(db, receiver_email: str, otp: str):
+    """Write the OTP email to the outbox in the caller's transaction; returns without touching SMTP.
+
+    Call `wake_email_outbox()` after committing so the delivery job picks it up straight away.
+    """
+    await EmailOutboxRepository.enqueue(db, receiver_email, OTP_SUBJECT, build_otp_body(otp))
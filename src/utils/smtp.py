@@ -0,0 +1,76 @@
+import smtplib
+from email.message import EmailMessage
+from src.core.logger import logger
+from src.core.config import SMTP_EMAIL, SMTP_PASSWORD, SMTP_HOST, SMTP_PORT, SMTP_USE_TLS
+
+
+class SMTPMailer:
+    """Blocking SMTP client that keeps one connection open across batches.
+
+    The STARTTLS + login handshake is paid once per connection instead of once per message; a
+    dropped connection is reopened transparently. Run it from a worker thread, never on the event loop.
+    """
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, use_tls: bool = SMTP_USE_TLS,
+                 username: str = SMTP_EMAIL, password: str = SMTP_PASSWORD, timeout: int = 30):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.sender = username or "no-reply@localhost"
+        self.connections_opened = 0
+        self._server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        self._server = server
+
+    def _ensure_connected(self):
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return
+            except (OSError, smtplib.SMTPException):
+                pass
+            self.close()
+        self._connect()
+
+    def send_batch(self, messages):
+        """Send (key, recipient, subject, body) tuples; returns {key: error or None}.
+
+        Raises OSError / smtplib.SMTPException when no connection can be opened at all.
+        """
+        results = {}
+        self._ensure_connected()
+        for key, recipient, subject, body in messages:
+            message = EmailMessage()
+            message["From"] = self.sender
+            message["To"] = recipient
+            message["Subject"] = subject
+            message.set_content(body)
+            try:
+                try:
+                    self._server.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    self._connect()
+                    self._server.send_message(message)
+                results[key] = None
+            except Exception as e:
+                logger.warning(f"Failed to send email to {recipient}: {e}")
+                results[key] = str(e)
+        return results
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None